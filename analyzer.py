@@ -1,13 +1,24 @@
-import pandas as pd
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate
 import time
+import argparse
 import coursework as cw
 import skills as sk
 import projects as pro
 import work_experience as we
 import jobs
+import bank_store as bs
+import job_bank as jb
 import analyzer_util as autil
+import models
+import llm_cache
+import streaming
+import resume_selection as rsel
+import ranking
+import resume_optimizer as ropt
+import resume_ga as ga
+import selection_parser as sparse
+import batch_resume as batch
+import job_fit
+import prompt_format as pformat
 import cli_util as cutil
 
 # General Overview:
@@ -20,6 +31,10 @@ import cli_util as cutil
 # 6. Write me a cover letter based off of this job
 
 def main_menu():
+    # save any bank edits made since the last visit to the main menu
+    bs.checkpoint()
+    jb.checkpoint()
+    
     valid = {
         '1': {"desc": "Adjust User Info", "func": adjust_user_info}, 
         '2': {"desc": "Analyze Job", "func": analyze_job}
@@ -45,17 +60,22 @@ def adjust_user_info():
     return cutil.input_choice(prompt, valid, "Please type 1 to adjust skills, 2 to adjust coursework, 3 to adjust projects, 4 to adjust work experience, or 5 to return to the main menu")
 
 def analyze_job():
+    # resume creation will need the reasoning model, start loading it while the user picks a job
+    models.warm_up_async(models.REASONING_MODEL)
+    
     valid = {
         '1': {"desc": "Add Job", "func": jobs.add_job, "args": [main_menu]}, 
         '2': {"desc": "Create Resume", "func": create_resume}, 
-        '3': {"desc": "Create Cover Letter", "func": create_cover_letter}
+        '3': {"desc": "Create Cover Letter", "func": create_cover_letter}, 
+        '4': {"desc": "Create Resumes for Several Jobs", "func": batch.batch_create_resumes, "args": [analyze_job]},
+        '5': {"desc": "Rank Jobs by Fit", "func": job_fit.show_ranking, "args": [analyze_job]}
     }
-    prompt = "Would you like to input a new job, create a resume or a cover letter?"
+    prompt = "Would you like to input a new job, create a resume or a cover letter, create resumes for several jobs at once, or see which jobs fit you best?"
     
-    return cutil.input_choice(prompt, valid, "Please type 1 to add a job, 2 to create a resume, or 3 to create a cover letter")
+    return cutil.input_choice(prompt, valid, "Please type 1 to add a job, 2 to create a resume, 3 to create a cover letter, 4 to create resumes for several jobs, or 5 to rank jobs by fit")
 
 def create_resume():
-    job_df = pd.read_csv('Stored Info/job_bank.csv')
+    job_df = jb.load_listing()
     if job_df.empty:
         print("No jobs found in the job bank. Please add a job first.")
         return analyze_job()
@@ -75,16 +95,21 @@ def create_resume():
 
     try:
         job_index = int(job_index)
-        selected_job = job_df.loc[job_index]
+        selected_job = jb.get_job(job_df.loc[job_index, 'id'], ['title', 'company', 'description'])
     except (ValueError, KeyError):
         print("Invalid job index.")
         return create_resume()
     
-    job_description = selected_job.iloc[0]['description']
+    job_description = selected_job['description']
     
-    print(f"\nCreating resume for job: {selected_job.iloc[0]['title']} at {selected_job.iloc[0]['company']}\n")
+    print(f"\nCreating resume for job: {selected_job['title']} at {selected_job['company']}\n")
     
-    resume_outline = create_resume_ai(job_description)
+    valid = {
+        '1': {"desc": "AI Selection (takes a few minutes)", "func": create_resume_ai, "args": [job_description]}, 
+        '2': {"desc": "Fast Selection (keyword ranking, no AI)", "func": create_resume_fast, "args": [job_description]},
+        '3': {"desc": "Explore Resume Variants (genetic search, no AI)", "func": create_resume_variants, "args": [job_description]}
+    }
+    resume_outline = cutil.input_choice("How should the resume items be selected?", valid, "Please type 1 for AI selection, 2 for fast selection or 3 to explore variants")
     
     print("\n" + "-"*30)
     print("Resume Outline Created:\n")
@@ -93,39 +118,56 @@ def create_resume():
     
     return analyze_job()
 
+def create_resume_fast(job_description):
+    all_items = rsel.load_bank_items()
+    t1 = time.time()
+    result = ranking.fast_selection(job_description, all_items)
+    print(f"Ranked {sum(len(rows) for rows in all_items.values())} items and fit them to one page in {(time.time() - t1) * 1000:.1f}ms")
+    print(f"Estimated height: {result['height']:.0f} of {ropt.PAGE_HEIGHT}pt")
+    return "\n".join(_outline_lines(result, all_items))
+
+def _outline_lines(result, all_items):
+    lines = rsel.describe_selection(result["selection"], all_items)
+    long_forms = [rsel.item_label("work_experience", all_items["work_experience"][index]) for index, form in result["forms"].items() if form == "long"]
+    if long_forms:
+        lines.append(f"Work experience with bullet points: {', '.join(long_forms)}")
+    return lines
+
+def create_resume_variants(job_description):
+    all_items = rsel.load_bank_items()
+    scores = ranking.page_scores(job_description, all_items)
+    problem = ga.Problem(all_items, scores)
+    best = ropt.optimize(all_items, scores)
+    seed_genomes = [ga.encode(problem, best["selection"], best["forms"])]
+
+    seed = 0
+    while True:
+        t1 = time.time()
+        population, _ = ga.evolve(problem, seed=seed, seed_genomes=seed_genomes)
+        variants = ga.distinct_variants(problem, population)
+        print(f"Searched {ga.GENERATIONS} generations of {ga.POPULATION_SIZE} resumes in {time.time() - t1:.1f}s\n")
+
+        for number, (_, result) in enumerate(variants, start=1):
+            print(f"Variant {number}: score {result['value']:.1f}, estimated height {result['height']:.0f} of {ropt.PAGE_HEIGHT}pt")
+            for line in _outline_lines(result, all_items):
+                print("  " + line)
+            print()
+
+        while True:
+            words = input(f"Pick a variant (1-{len(variants)}), or type more and a number to search again around it (e.g. more 2): ").strip().lower().split()
+            number = int(words[-1]) if words and words[-1].isdigit() else 0
+            if 1 <= number <= len(variants) and words in (["more", words[-1]], [words[-1]]):
+                break
+            print("Invalid choice.")
+
+        genome, result = variants[number - 1]
+        if words[0] != "more":
+            return "\n".join(_outline_lines(result, all_items))
+        seed_genomes = [genome]
+        seed += 1
+
 def create_resume_ai(job_description):
     print("Loading assistant...")
-    generate_resume_prompt = """
-    
-    You are an expert career coach. A client has provided you with a job description for a position they are interested in applying for.
-    You have access to a large dataset of the client's skills, projects, coursework, and work experience.
-    
-    Based off of the job description, please analyze the client's datasets and determine which skills, projects, coursework, and work experience are most relevant to the job.
-    Your goal is to help the client create a tailored resume that highlights their most relevant qualifications for the job.
-    
-    Job Description: {job_description}
-    
-    The client's datasets are as follows:
-    
-    Coursework: {coursework}
-    Projects: {projects}
-    Skills: {skills}
-    Work Experience: {work_experience}
-    
-    The client would like you to select the most relevant items from each dataset to include in their resume. The resume is meant to be no longer than a single page, so please be selective in your choices.
-    
-    Make sure to include in your answer a python valid dictionary, where the keys are the sections of the resume, and the values are a list of the indices of the items from the datasets that you think should correspond to the dataset.
-    This dictionary is essential to be included in the proper format, as the program will not function otherwise.
-    For example, if you think that you want to include skills 1, 3, and 5 from the skills dataset, and projects 2 and 4 from the projects dataset, your response should look like this:
-    
-    {{"skills": [1, 3, 5], "projects": [2, 4], "coursework": [...], "work_experience": [...]}}
-    
-    """
-    refine_resume_prompt = """
-    
-    
-  
-    """
     showReasoning = False
     print("The model will think for a bit to ensure a good answer. Would you like to show the thinking (May clog up terminal)? Y/N")
     
@@ -139,47 +181,25 @@ def create_resume_ai(job_description):
         print("Thinking...")
     
     t1 = time.time()
-    generative_model = ChatOllama(model="deepseek-r1", streaming=True, reasoning=True)
+    generative_model = models.get_model(models.REASONING_MODEL, streaming=True, reasoning=True)
     print(f"Model init took: {time.time() - t1:.2f}s")
     
     t2 = time.time()
-    prompt = ChatPromptTemplate.from_template(generate_resume_prompt)
-    chain = prompt | generative_model
+    chain = models.get_chain(rsel.GENERATE_RESUME_PROMPT, models.REASONING_MODEL, streaming=True, reasoning=True)
     print(f"Chain creation took: {time.time() - t2:.2f}s")
     
-    coursework = pd.read_csv('Stored Info/coursework_bank.csv').to_dict(orient='index')
-    projects = pd.read_csv('Stored Info/projects_bank.csv').to_dict(orient='index')
-    skills = pd.read_csv('Stored Info/skills_bank.csv').to_dict(orient='index')
-    work_experience = pd.read_csv('Stored Info/work_experience_bank.csv').to_dict(orient='index')
-    
-    inputs = {"coursework": coursework, "projects": projects, "skills": skills, "work_experience": work_experience, "job_description": job_description}
+    all_items = rsel.load_bank_items()
+    inputs, valid_indices = rsel.build_inputs(job_description, all_items)
     
-    print("Waiting for first token...")
-    t3 = time.time()
+    pformat.report_prompt_size(inputs)
     
-    print("Initializing Response (May take a bit to get started)...\n")
-    first_token_received = False
+    # stop the stream as soon as the selection dict is complete, the explanation after it is not used
+    parser = sparse.SelectionParser(valid_indices)
+    summary_text = streaming.stream_with_cache(chain, models.REASONING_MODEL, rsel.GENERATE_RESUME_PROMPT, inputs, showReasoning, label="resume selection", stop=parser.feed)
+    rsel.report_selection(parser, all_items)
     
-    summary_text = ""
-    
-    for chunk in chain.stream(inputs):
-        if not first_token_received:
-            print(f"First token received after: {time.time() - t3:.2f}s")
-            first_token_received = True
-        # Check for reasoning (thinking) tokens
-        # These are usually in additional_kwargs when reasoning=True
-        reasoning = chunk.additional_kwargs.get("reasoning_content", "")
-        if reasoning and showReasoning:
-            print(f"\033[90m{reasoning}\033[0m", end="", flush=True)
-        
-        # Check for the actual answer tokens
-        content = chunk.content
-        if content:
-            print(content, end="", flush=True)
-            summary_text += content
-    
-    followup_prompt = ChatPromptTemplate.from_template(refine_resume_prompt)
-    followup_chain = followup_prompt | generative_model
+    # follow-ups extend the first request's messages, so Ollama can reuse the prompt it already evaluated
+    history = rsel.first_messages(inputs)
     
     while True: # fix formatting here, we want it to match previous messages
         user_input = input("\nAsk a followup question (or type 'exit' to quit) >>> ").strip()
@@ -188,29 +208,15 @@ def create_resume_ai(job_description):
             print("Finalizing bullet points...")
             break
         
-        followup_inputs = {
-            "user_feedback": user_input,
-            "original_resume_outline": summary_text,
-            "coursework": coursework, 
-            "projects": projects, 
-            "skills": skills, 
-            "work_experience": work_experience, 
-            "job_description": job_description
-        }
-        
-        summary_text = ""
+        history = rsel.followup_messages(history, summary_text, user_input)
         
-        for chunk in followup_chain.stream(followup_inputs):
-            # Check for reasoning (thinking) tokens
-            reasoning = chunk.additional_kwargs.get("reasoning_content", "")
-            if reasoning and showReasoning:
-                print(f"\033[90m{reasoning}\033[0m", end="", flush=True)
-            
-            # Check for the actual answer tokens
-            content = chunk.content
-            if content:
-                print(content, end="", flush=True)
-                summary_text += content
+        # not stopped early: a follow-up may be a question with no new selection, and the token counts come at the end
+        followup_parser = sparse.SelectionParser(valid_indices)
+        result = streaming.consume(generative_model.stream(history), show_reasoning=showReasoning, label="resume refinement", model=models.REASONING_MODEL)
+        summary_text = result.text
+        if followup_parser.feed(summary_text):
+            rsel.report_selection(followup_parser, all_items)
+        rsel.report_prompt_reuse(result, history)
     
     return summary_text.strip()
     
@@ -233,5 +239,14 @@ def create_cover_letter():
     pass
     
 if __name__ == "__main__":
-    autil.init_check()
+    parser = argparse.ArgumentParser(description="JobAnalyzer")
+    parser.add_argument("--fast-start", action="store_true", help="run the startup backup in the background so the main menu shows right away")
+    parser.add_argument("--no-llm-cache", action="store_true", help="always ask the model instead of reusing saved answers")
+    parser.add_argument("--job-csv", action="store_true", help="keep Stored Info/job_bank.csv (uncompressed, for other tools) in step with the job bank")
+    args = parser.parse_args()
+    
+    llm_cache.enabled = not args.no_llm_cache
+    jb.csv_mirror = args.job_csv
+
+    autil.init_check(fast_start=args.fast_start)
     main_menu()
\ No newline at end of file
@@ -1,12 +1,125 @@
 import csv
 import json
-import shutil
-from datetime import datetime
+import sqlite3
+import threading
 from pathlib import Path
+import backup_store as bstore
 import cli_util as cutil
 from cli_util import CommonConstraints as cc
 
-def init_check(): # check to make sure all necessary folders and files are made
+CSV_HEADERS = {
+    "coursework_bank.csv": ["course_id", "course_name", "institution", "year", "semester", "grade", "description"],
+    "projects_bank.csv": ["project_name", "description", "start_month", "start_year", "end_month", "end_year", "link1", "link2"],
+    "skills_bank.csv": ["skill_name", "level"],
+    "work_experience_bank.csv": [
+        "company", 
+        "role", 
+        "start_month", 
+        "start_year", 
+        "end_month", 
+        "end_year", 
+        "long_short", # True for long description, False for short
+        "description_short", 
+        "bullet1_long", 
+        "bullet2_long", 
+        "bullet3_long"
+    ],
+    "job_bank.csv": [
+            "id",
+            "site",
+            "job_url",
+            "job_url_direct",
+            "title",
+            "company",
+            "location",
+            "date_posted",
+            "job_type",
+            "salary_source",
+            "interval",
+            "min_amount",
+            "max_amount",
+            "currency",
+            "is_remote",
+            "job_level",
+            "job_function",
+            "listing_type",
+            "emails",
+            "description",
+            "company_industry",
+            "company_url",
+            "company_logo",
+            "company_url_direct",
+            "company_addresses",
+            "company_num_employees",
+            "company_revenue",
+            "company_description",
+            "skills",
+            "experience_range",
+            "company_rating",
+            "company_reviews_count",
+            "vacancy_count",
+            "work_from_home_type"
+        ]
+}
+
+JSON_HEADERS = {
+    "user_info.json": [
+        "full_name",
+        "email",
+        "phone_number",
+        "linkedin_url",
+        "github_url",
+        "portfolio_url",
+        "address"
+    ]
+}
+
+# header checks that passed, keyed by file path: {"size", "mtime_ns", "sha256", "headers"}
+VALIDATION_CACHE_PATH = Path("Cache") / "validation_cache.json"
+
+def _load_validation_cache():
+    try:
+        return json.loads(VALIDATION_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _is_cached_valid(cache, item_path: Path, expected_headers):
+    # unchanged size and mtime means the file passed last time and was not touched since, so it is not opened at all.
+    # if only the stat changed (e.g. a save with identical content), the content hash decides
+    entry = cache.get(item_path.as_posix())
+    if not entry or entry["headers"] != expected_headers:
+        return False
+    stat = item_path.stat()
+    if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    if entry["size"] == stat.st_size and entry["sha256"] == bstore.hash_file(item_path):
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+    return False
+
+def _remember_valid(cache, item_path: Path, expected_headers):
+    stat = item_path.stat()
+    # hash_file caches by stat as well, so the backup that follows does not hash this file again
+    cache[item_path.as_posix()] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": bstore.hash_file(item_path), "headers": expected_headers}
+
+def _database_ok(item_path: Path):
+    try:
+        conn = sqlite3.connect(item_path)
+        try:
+            return conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return False
+
+def _run_backup():
+    try:
+        bstore.create_snapshot()
+        bstore.prune_snapshots()
+    except Exception as e:
+        print(f"Error during backup process: {e}")
+
+def init_check(fast_start=False): # check to make sure all necessary folders and files are made
     print("------------------------")
     print("Performing startup check")
     print("------------------------")
@@ -17,12 +130,13 @@ def init_check(): # check to make sure all necessary folders and files are made
 
     structure = {
         "BACKUPS": [],
+        "Cache": [],
         "Outputs": [
             "Cover Letters",
             "Resumes",
         ],
-        "Stored Info": [
-            "job_bank.csv",
+        "Stored Info": [ # the job bank lives in job_bank.db (see job_bank.py), job_bank.csv is only an optional export
+            "job_bank.db",
             "coursework_bank.csv",
             "projects_bank.csv",
             "skills_bank.csv",
@@ -31,72 +145,7 @@ def init_check(): # check to make sure all necessary folders and files are made
         ],
     }
 
-    csv_headers = {
-        "coursework_bank.csv": ["course_id", "course_name", "institution", "year", "semester", "grade", "description"],
-        "projects_bank.csv": ["project_name", "description", "start_month", "start_year", "end_month", "end_year", "link1", "link2"],
-        "skills_bank.csv": ["skill_name", "level"],
-        "work_experience_bank.csv": [
-            "company", 
-            "role", 
-            "start_month", 
-            "start_year", 
-            "end_month", 
-            "end_year", 
-            "long_short", # True for long description, False for short
-            "description_short", 
-            "bullet1_long", 
-            "bullet2_long", 
-            "bullet3_long"
-        ],
-        "job_bank.csv": [
-                "id",
-                "site",
-                "job_url",
-                "job_url_direct",
-                "title",
-                "company",
-                "location",
-                "date_posted",
-                "job_type",
-                "salary_source",
-                "interval",
-                "min_amount",
-                "max_amount",
-                "currency",
-                "is_remote",
-                "job_level",
-                "job_function",
-                "listing_type",
-                "emails",
-                "description",
-                "company_industry",
-                "company_url",
-                "company_logo",
-                "company_url_direct",
-                "company_addresses",
-                "company_num_employees",
-                "company_revenue",
-                "company_description",
-                "skills",
-                "experience_range",
-                "company_rating",
-                "company_reviews_count",
-                "vacancy_count",
-                "work_from_home_type"
-            ]
-    }
-
-    json_headers = {
-        "user_info.json": [
-            "full_name",
-            "email",
-            "phone_number",
-            "linkedin_url",
-            "github_url",
-            "portfolio_url",
-            "address"
-        ]
-    }
+    validation_cache = _load_validation_cache()
 
     for folder, contents in structure.items():
         folder_path = base_dir / folder
@@ -111,7 +160,7 @@ def init_check(): # check to make sure all necessary folders and files are made
             # CSV file
             if item_path.suffix == ".csv":
                 
-                expected_headers = csv_headers.get(item, [])
+                expected_headers = CSV_HEADERS.get(item, [])
                 
                 if not item_path.exists(): # if the .csv isnt there, create a new one
                     with item_path.open("w", newline="", encoding="utf-8") as f:
@@ -119,6 +168,9 @@ def init_check(): # check to make sure all necessary folders and files are made
                         writer.writerow(expected_headers)
                     print(f"Created file with headers: {item_path}")
 
+                if _is_cached_valid(validation_cache, item_path, expected_headers):
+                    continue
+
                 with item_path.open("r", newline="", encoding="utf-8") as f: # get the existing headers to prepare for integrity check
                     reader = csv.reader(f)
                     existing_headers = next(reader, [])
@@ -153,15 +205,51 @@ Selection: """
                             writer = csv.writer(f)
                             writer.writerow(expected_headers)
                     # result == 3 does nothing
+                else:
+                    _remember_valid(validation_cache, item_path, expected_headers)
+
+            elif item_path.suffix == ".db":
+                # created with its schema the first time it is used, and a fresh one has nothing to check
+                if not item_path.exists() or _is_cached_valid(validation_cache, item_path, ["quick_check"]):
+                    continue
+
+                if not _database_ok(item_path):
+                    healthy = False
+                    print(
+                        f"⚠️  Integrity check failed for {item_path} ⚠️\n"
+                        f"   !!! The database may be corrupted !!!\n"
+                    )
+
+                    prompt = """How would you like to proceed?
+1. Load from backup
+2. Remake file (every stored job is lost)
+3. Proceed without doing anything (not advisable)
+Selection: """
+                    valid = {'1': {'desc': 'Load from backup', 'func': cutil.return_self_dummy, 'args': ['1']},
+                                 '2': {'desc': 'Remake file', 'func': cutil.return_self_dummy, 'args': ['2']},
+                                 '3': {'desc': 'Proceed without doing anything', 'func': cutil.return_self_dummy, 'args': ['3']}}
+                    result = cutil.input_choice(prompt, valid, "Please type 1 to load from a backup, 2 to remake the file, or 3 to proceed without doing anything")
+
+                    if result == '1':
+                        load_backup(item_path)
+                    elif result == '2':
+                        _remove_database_journals(item_path)
+                        item_path.unlink()
+                    # result == 3 does nothing
+                else:
+                    _remember_valid(validation_cache, item_path, ["quick_check"])
 
             elif item_path.suffix == ".json":
-                expected_headers = json_headers.get(item, [])
+                expected_headers = JSON_HEADERS.get(item, [])
                 
                 if not item_path.exists():
                     with item_path.open("w", encoding="utf-8") as f:
                         json.dump({key: "" for key in expected_headers}, f, indent=4)
                     print(f"Created file with headers: {item_path}")
                 
+                if _is_cached_valid(validation_cache, item_path, expected_headers):
+                    continue
+                
                 with item_path.open("r", encoding="utf-8") as f:
                     existing_data = json.load(f)
                     existing_headers = list(existing_data.keys())
@@ -196,6 +284,8 @@ Selection: """
                         with item_path.open("w", encoding="utf-8") as f:
                             json.dump({key: "" for key in expected_headers}, f, indent=4)
                     # result == 3 does nothing
+                else:
+                    _remember_valid(validation_cache, item_path, expected_headers)
                     
             # Directory
             else:
@@ -203,62 +293,45 @@ Selection: """
                     item_path.mkdir(parents=True)
                     print(f"Created folder: {item_path}")
         
-    if healthy:
-        print("Generating backup...")
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        path = Path("BACKUPS") / timestamp
-        try:
-            # Create the main backup folder
-            path.mkdir(parents=True, exist_ok=True)
-            print(f"Successfully created: {path}")
-
-            # List of folders to back up
-            folders_to_backup = ["Outputs", "Stored Info"]
-
-            for folder_name in folders_to_backup:
-                source = Path(folder_name)
-                destination = path / folder_name
-                
-                if source.exists():
-                    # copytree creates the destination directory automatically
-                    shutil.copytree(source, destination)
-                    print(f"Copied {folder_name} to {destination}")
-                else:
-                    print(f"Warning: Source folder '{folder_name}' not found. Skipping.")
-
-        except Exception as e:
-            print(f"Error during backup process: {e}")
-        
-        
+    VALIDATION_CACHE_PATH.write_text(json.dumps(validation_cache, indent=1), encoding="utf-8")
         
+    if healthy:
+        if fast_start:
+            # not a daemon thread, so the interpreter still waits for the backup to finish before exiting
+            print("Generating backup in the background...")
+            threading.Thread(target=_run_backup, name="startup-backup").start()
+        else:
+            print("Generating backup...")
+            _run_backup()
     
     print("\n----------------------")
     print("Startup Check Complete")
     print("----------------------\n")
 
+def _remove_database_journals(item_path: Path):
+    # a leftover journal belongs to the damaged file, sqlite would roll it into whatever replaces it
+    for suffix in ("-journal", "-wal", "-shm"):
+        Path(str(item_path) + suffix).unlink(missing_ok=True)
+
 def load_backup(item_path: Path):
-    backup_dir = Path("BACKUPS")
+    # backups made before the content-addressed store were full copies in BACKUPS/<timestamp>
+    bstore.import_legacy_backups()
+    if item_path.suffix == ".db":
+        _remove_database_journals(item_path)
+    restored_from = bstore.restore_file(item_path)
+    if restored_from:
+        print(f"Replaced file {item_path.name} with its backup from {restored_from}")
+        return
     
-    subfolders = [f for f in backup_dir.iterdir() if f.is_dir()]
+    print("No backups found, creating from scratch")
     
-    if not subfolders:
-        print("No backups found, creating from scratch")
-        
-        headers = {
-            "coursework_bank.csv": ["course_id", "course_name", "institution", "year", "grade", "description"],
-            "projects_bank.csv": ["project_name", "description", "date", "link1", "link2"],
-            "skills_bank.csv": ["skill_name", "level"],
-            "work_experience_bank.csv": ["company", "role", "start_date", "end_date", "description"],
-        }
-        Path(item_path).unlink()
+    Path(item_path).unlink()
+    if item_path.suffix == ".db":
+        pass # job_bank.py creates the schema again on first use
+    elif item_path.suffix == ".json":
+        with item_path.open("w", encoding="utf-8") as f:
+            json.dump({key: "" for key in JSON_HEADERS[item_path.name]}, f, indent=4)
+    else:
         with open(item_path, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(headers[item_path.name])
-        return
-    
-    most_recent = max(subfolders, key=lambda f: f.name)
-    backup_item = most_recent / "Stored Info" / item_path.name
-    Path(item_path).unlink()
-    item_path.write_bytes(backup_item.read_bytes())
-    
-    print(f"Replaced file {item_path.name} with its backup from {most_recent}")
\ No newline at end of file
+            writer.writerow(CSV_HEADERS[item_path.name])
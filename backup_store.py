@@ -0,0 +1,218 @@
+import hashlib
+import json
+import shutil
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+# Content-addressed backups.
+# Every backed up file is stored once under BACKUPS/objects/<first 2 hex chars>/<sha256>, and each snapshot is a
+# small json manifest in BACKUPS/snapshots mapping relative paths to those hashes. Files that did not change
+# since the last snapshot are neither copied nor re-hashed (hashes are cached by size and mtime).
+# SQLite databases are copied with the sqlite backup API rather than byte for byte, so a snapshot taken while the
+# program writes to them (the --fast-start backup runs in the background) still holds a consistent database.
+# The full-copy BACKUPS/<timestamp> folders of older versions are imported as snapshots once, then pruned like them.
+
+BACKUP_DIR = Path("BACKUPS")
+OBJECTS_DIR = BACKUP_DIR / "objects"
+SNAPSHOTS_DIR = BACKUP_DIR / "snapshots"
+HASH_INDEX_PATH = BACKUP_DIR / "hash_index.json"
+
+BACKED_UP_FOLDERS = ["Outputs", "Stored Info"]
+KEEP_SNAPSHOTS = 20 # retention policy, older snapshots are pruned after every new one
+
+# temp files and sqlite side files are never consistent on their own
+SKIPPED_SUFFIXES = (".tmp", ".db-journal", ".db-wal", ".db-shm")
+# exports that can be written again from what is backed up (job_bank.csv comes from job_bank.db)
+SKIPPED_FILES = {"job_bank.csv"}
+
+_hash_index = None # "path" -> [size, mtime_ns, sha256]
+
+def _load_hash_index():
+    global _hash_index
+    if _hash_index is None:
+        try:
+            _hash_index = json.loads(HASH_INDEX_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _hash_index = {}
+    return _hash_index
+
+def _save_hash_index():
+    if _hash_index is not None:
+        BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        HASH_INDEX_PATH.write_text(json.dumps(_hash_index), encoding="utf-8")
+
+def _sha256(path: Path):
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_file(path: Path):
+    """Return the sha256 of a file, reusing the cached hash when its size and mtime have not changed"""
+    index = _load_hash_index()
+    stat = path.stat()
+    cached = index.get(path.as_posix())
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+
+    sha = _sha256(path)
+    index[path.as_posix()] = [stat.st_size, stat.st_mtime_ns, sha]
+    return sha
+
+def _object_path(sha):
+    return OBJECTS_DIR / sha[:2] / sha
+
+def _store_object(path: Path, sha):
+    destination = _object_path(sha)
+    if destination.exists():
+        return False
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(sha + ".tmp")
+    shutil.copyfile(path, tmp_path)
+    tmp_path.replace(destination)
+    return True
+
+def _store_database(path: Path):
+    """Store a consistent copy of a SQLite database. Returns its sha256 and whether it was not stored before"""
+    index = _load_hash_index()
+    stat = path.stat()
+    cached = index.get(path.as_posix())
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns and _object_path(cached[2]).exists():
+        return cached[2], False
+
+    OBJECTS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = OBJECTS_DIR / (path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    source = sqlite3.connect(path)
+    target = sqlite3.connect(tmp_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+    sha = _sha256(tmp_path)
+    destination = _object_path(sha)
+    is_new = not destination.exists()
+    if is_new:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.replace(destination)
+    else:
+        tmp_path.unlink()
+    # keyed on the stat from before the copy, a write during it makes the next snapshot copy again
+    index[path.as_posix()] = [stat.st_size, stat.st_mtime_ns, sha]
+    return sha, is_new
+
+def list_snapshots():
+    """Return snapshot manifest paths, oldest first"""
+    if not SNAPSHOTS_DIR.exists():
+        return []
+    return sorted(SNAPSHOTS_DIR.glob("*.json"))
+
+def _read_manifest(manifest_path):
+    return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+def create_snapshot(folders=BACKED_UP_FOLDERS):
+    """
+    Back up every file in folders. Returns the path of the new manifest, or None when nothing changed since the
+    last snapshot
+    """
+    files = {}
+    new_objects = 0
+    for folder_name in folders:
+        source = Path(folder_name)
+        if not source.exists():
+            print(f"Warning: Source folder '{folder_name}' not found. Skipping.")
+            continue
+        for path in sorted(source.rglob("*")):
+            if not path.is_file() or path.name.endswith(SKIPPED_SUFFIXES) or path.name in SKIPPED_FILES:
+                continue
+            if path.suffix == ".db":
+                sha, is_new = _store_database(path)
+            else:
+                sha = hash_file(path)
+                is_new = _store_object(path, sha)
+            new_objects += is_new
+            files[path.as_posix()] = sha
+    _save_hash_index()
+
+    snapshots = list_snapshots()
+    if snapshots and _read_manifest(snapshots[-1])["files"] == files:
+        print(f"No changes since the last backup ({snapshots[-1].stem})")
+        return None
+
+    SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    manifest_path = SNAPSHOTS_DIR / f"{timestamp}.json"
+    manifest_path.write_text(json.dumps({"created": timestamp, "files": files}, indent=1), encoding="utf-8")
+    print(f"Created backup {timestamp}: {len(files)} files, {new_objects} new")
+    return manifest_path
+
+def import_legacy_backups(keep=KEEP_SNAPSHOTS):
+    """
+    Move the full-copy backups made before this store (BACKUPS/<timestamp>/<folder>/...) into it, each as a snapshot
+    named after its folder. Only the folders that would survive pruning (the newest keep of them and the existing
+    snapshots together) are read, the rest are deleted unread. Returns the number of folders imported
+    """
+    if not BACKUP_DIR.exists():
+        return 0
+    legacy = sorted(f for f in BACKUP_DIR.iterdir() if f.is_dir() and f not in (OBJECTS_DIR, SNAPSHOTS_DIR))
+    if not legacy:
+        return 0
+    # timestamps in both names sort the same way
+    newest = set(sorted([f.name for f in legacy] + [manifest_path.stem for manifest_path in list_snapshots()])[-keep:])
+
+    imported = 0
+    for folder in legacy:
+        manifest_path = SNAPSHOTS_DIR / f"{folder.name}.json"
+        if folder.name in newest and not manifest_path.exists():
+            files = {}
+            for path in sorted(folder.rglob("*")):
+                if not path.is_file() or path.name.endswith(SKIPPED_SUFFIXES):
+                    continue
+                sha = _sha256(path)
+                _store_object(path, sha)
+                files[path.relative_to(folder).as_posix()] = sha
+            SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+            manifest_path.write_text(json.dumps({"created": folder.name, "files": files}, indent=1), encoding="utf-8")
+            imported += 1
+        shutil.rmtree(folder)
+    print(f"Imported {imported} old full-copy backups, deleted {len(legacy) - imported} older ones")
+    return imported
+
+def prune_snapshots(keep=KEEP_SNAPSHOTS):
+    """Delete all but the newest keep snapshots, then every stored file no remaining snapshot refers to"""
+    import_legacy_backups(keep)
+    snapshots = list_snapshots()
+    if len(snapshots) <= keep:
+        return 0
+    for manifest_path in snapshots[:len(snapshots) - keep]:
+        manifest_path.unlink()
+
+    referenced = set()
+    for manifest_path in list_snapshots():
+        referenced.update(_read_manifest(manifest_path)["files"].values())
+
+    removed = 0
+    for object_path in OBJECTS_DIR.glob("*/*"):
+        if object_path.name not in referenced:
+            object_path.unlink()
+            removed += 1
+            if not any(object_path.parent.iterdir()):
+                object_path.parent.rmdir()
+    print(f"Pruned {len(snapshots) - keep} old backups ({removed} unused files removed)")
+    return removed
+
+def restore_file(item_path: Path):
+    """Overwrite item_path with its copy from the newest snapshot that has it. Returns the snapshot name or None"""
+    key = Path(item_path).as_posix()
+    for manifest_path in reversed(list_snapshots()):
+        sha = _read_manifest(manifest_path)["files"].get(key)
+        if sha and _object_path(sha).exists():
+            tmp_path = Path(item_path).with_name(Path(item_path).name + ".tmp")
+            shutil.copyfile(_object_path(sha), tmp_path)
+            tmp_path.replace(item_path)
+            return manifest_path.stem
+    return None
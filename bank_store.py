@@ -0,0 +1,103 @@
+import atexit
+import itertools
+from pathlib import Path
+
+# Shared in-memory store for the CSV banks in 'Stored Info'.
+# Each bank is read from disk once per session, every read after that is served from memory,
+# and edits only mark the bank dirty. Dirty banks are written back on checkpoint() or when the program exits.
+# Appended and removed rows are only recorded, and folded into the DataFrame in one pass the next time it is read
+# (get_bank) or written, since growing or shrinking a DataFrame a row at a time rebuilds every column.
+
+STORED_INFO_DIR = Path("Stored Info")
+
+_banks = {} # bank file name -> DataFrame
+_dirty = set() # bank file names with unsaved changes
+_appended = {} # bank file name -> [row dicts] not in the DataFrame yet
+_removed = {} # bank file name -> index labels still to drop from the DataFrame
+_versions = {} # bank file name -> number bumped by every change, so caches built from a bank can tell it changed
+_changes = itertools.count(1)
+
+def get_bank(name):
+    """Return the DataFrame for a bank file (e.g. 'skills_bank.csv'), loading it from disk on first use"""
+    if name not in _banks:
+        import pandas as pd
+        _banks[name] = pd.read_csv(STORED_INFO_DIR / name)
+    if name in _appended or name in _removed:
+        _apply_pending(name)
+    return _banks[name]
+
+def _apply_pending(name):
+    import pandas as pd
+    df = _banks[name]
+    removed = _removed.pop(name, None)
+    if removed:
+        df = df.drop(index=list(removed))
+    rows = _appended.pop(name, None)
+    if rows:
+        next_index = df.index.max() + 1 if len(df.index) else 0
+        new_rows = pd.DataFrame([[row.get(column) for column in df.columns] for row in rows], columns=df.columns, index=range(next_index, next_index + len(rows)))
+        df = pd.concat([df, new_rows]) if len(df.index) else new_rows
+    _banks[name] = df
+
+def version(name):
+    """A number that changes whenever the bank does (edits, replacement, reload)"""
+    return _versions.get(name, 0)
+
+def _changed(name):
+    _versions[name] = next(_changes)
+
+def set_bank(name, df):
+    """Replace the in-memory copy of a bank and mark it as needing a write"""
+    _banks[name] = df
+    _appended.pop(name, None)
+    _removed.pop(name, None)
+    mark_dirty(name)
+
+def append_row(name, row: dict):
+    """Append a single row to a bank. Columns missing from row are left empty"""
+    if name not in _banks:
+        get_bank(name)
+    _appended.setdefault(name, []).append(dict(row))
+    mark_dirty(name)
+
+def remove_rows(name, mask):
+    """Drop the rows of a bank selected by a boolean mask over the DataFrame get_bank returned"""
+    df = get_bank(name)
+    _removed.setdefault(name, set()).update(df.index[mask])
+    mark_dirty(name)
+
+def mark_dirty(name):
+    """Flag a bank edited in place as needing a write"""
+    _dirty.add(name)
+    _changed(name)
+
+def is_dirty(name=None):
+    return bool(_dirty) if name is None else name in _dirty
+
+def checkpoint():
+    """Write every dirty bank back to 'Stored Info'. Cheap to call when nothing has changed"""
+    for name in sorted(_dirty):
+        path = STORED_INFO_DIR / name
+        tmp_path = path.with_name(path.name + ".tmp")
+        # write to a temp file first so a crash mid-write never leaves a half written bank behind
+        get_bank(name).to_csv(tmp_path, index=False)
+        tmp_path.replace(path)
+    _dirty.clear()
+
+def reload(name=None):
+    """Drop cached banks so the next get_bank() reads from disk again (e.g. after restoring a backup)"""
+    if name is None:
+        _banks.clear()
+        _dirty.clear()
+        _appended.clear()
+        _removed.clear()
+        for loaded in list(_versions):
+            _changed(loaded)
+    else:
+        _banks.pop(name, None)
+        _dirty.discard(name)
+        _appended.pop(name, None)
+        _removed.pop(name, None)
+        _changed(name)
+
+atexit.register(checkpoint)
@@ -0,0 +1,175 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+import job_bank as jb
+import models
+import ranking
+import resume_selection as rsel
+import cli_util as cutil
+
+# Resume selection for many jobs at once, e.g. after a big scrape.
+# The prompts are built up front on the main thread (bank and job bank reads are not shared across threads), then
+# the model calls run in a thread pool no wider than the number of requests Ollama serves in parallel, and every
+# answer is written to Outputs/Resumes/Selections/<job id>.json as soon as it arrives, so an interrupted batch keeps
+# what it finished. Fast mode skips the model and ranks with ranking.fast_selection instead.
+
+OUTPUT_DIR = Path("Outputs") / "Resumes" / "Selections"
+
+# Ollama handles OLLAMA_NUM_PARALLEL requests per model at once (4 unless memory is tight), more threads only queue
+DEFAULT_CONCURRENCY = int(os.environ.get("OLLAMA_NUM_PARALLEL") or 4)
+
+def parse_indices(text, valid):
+    """Parse "1, 4, 7-9" into a list of indices, keeping only those in `valid`. Returns None if the text is malformed"""
+    indices = []
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = (int(value) for value in part.split("-", 1))
+                indices.extend(range(first, last + 1))
+            else:
+                indices.append(int(part))
+        except ValueError:
+            return None
+    return [index for index in dict.fromkeys(indices) if index in valid]
+
+def output_path(job_id):
+    safe_id = "".join(char if char.isalnum() or char in "-_" else "_" for char in str(job_id))
+    return OUTPUT_DIR / f"{safe_id}.json"
+
+def selected_items(selection, all_items):
+    """{section: [{"index", "key"}]} for a selection, the key being rsel.item_key, which survives the bank being renumbered"""
+    if selection is None:
+        return None
+    return {
+        section: [{"index": index, "key": rsel.item_key(section, all_items[section][index])} for index in indices if index in all_items.get(section, {})]
+        for section, indices in selection.items()
+    }
+
+def save_result(job, response, selection, seconds, all_items, rejected=None, method="ai", forms=None):
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    path = output_path(job["id"])
+    record = {
+        "job_id": job["id"],
+        "title": job["title"],
+        "company": job["company"],
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(seconds, 2),
+        "method": method, # "ai" or "fast" (ranking.fast_selection, no model)
+        "selection": selection, # None when the answer held no valid selection dict
+        "items": selected_items(selection, all_items), # the same picks with the name of each row, indices alone go stale
+        "rejected": rejected or {},
+        "forms": forms or {}, # work experience index -> "long" or "short", fast mode only
+        "response": response,
+    }
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=4)
+    os.replace(tmp_path, path)
+    return path
+
+def _timed_selection(inputs, valid_indices):
+    t1 = time.time()
+    response, parser = rsel.generate_selection(inputs, valid_indices)
+    return response, parser, time.time() - t1
+
+def run_fast_batch(jobs):
+    """Select the resume items for each job with ranking.fast_selection, no model involved. Returns {job id: saved path}"""
+    all_items = rsel.load_bank_items()
+    saved = {}
+    t1 = time.time()
+    for job in jobs:
+        t2 = time.time()
+        result = ranking.fast_selection(job["description"] or "", all_items)
+        saved[job["id"]] = save_result(job, None, result["selection"], time.time() - t2, all_items, method="fast", forms=result["forms"])
+    print(f"\nRanked {len(jobs)} jobs in {time.time() - t1:.2f}s, results are in {OUTPUT_DIR}")
+    return saved
+
+def run_batch(jobs, concurrency=DEFAULT_CONCURRENCY):
+    """
+    jobs: list of dicts with id, title, company and description. Runs the resume selection for each of them with at
+    most `concurrency` requests in flight, saving each answer as it finishes.
+    Returns {job id: saved path} for the jobs that succeeded and {job id: error message} for those that failed.
+    """
+    all_items = rsel.load_bank_items()
+    prepared = [(job, *rsel.build_inputs(job["description"] or "", all_items, verbose=False)) for job in jobs]
+
+    # create the shared client here rather than racing to create it from the workers
+    models.get_chain(rsel.GENERATE_RESUME_PROMPT, models.REASONING_MODEL, streaming=True, reasoning=True)
+
+    saved, failed = {}, {}
+    t1 = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="resume-batch") as executor:
+        futures = {executor.submit(_timed_selection, inputs, valid_indices): job for job, inputs, valid_indices in prepared}
+        for done, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            try:
+                response, parser, seconds = future.result()
+            except Exception as e:
+                failed[job["id"]] = str(e)
+                print(f"[{done}/{len(futures)}] {job['title']} at {job['company']}: failed ({e})")
+                continue
+            saved[job["id"]] = save_result(job, response, parser.selection, seconds, all_items, parser.rejected)
+            note = "" if parser.selection is not None else ", but no selection could be read from the answer"
+            print(f"[{done}/{len(futures)}] {job['title']} at {job['company']}: done in {seconds:.1f}s{note}")
+
+    print(f"\nAnalyzed {len(saved)} of {len(jobs)} jobs in {time.time() - t1:.1f}s, results are in {OUTPUT_DIR}")
+    return saved, failed
+
+def _pick_by_index(job_df):
+    while True:
+        text = input("Enter the job indices to analyze, e.g. 0, 3, 5-9 (or type all): ").strip().lower()
+        if text == "all":
+            return job_df
+        indices = parse_indices(text, set(job_df.index))
+        if indices:
+            return job_df.loc[indices]
+        print("No valid job indices given.")
+
+def _pick_by_filter(job_df):
+    company = input("Only jobs at companies containing (leave empty for any): ").strip()
+    posted_since = input("Only jobs posted on or after YYYY-MM-DD (leave empty for any): ").strip()
+    matches = jb.find_jobs(company or None, posted_since or None)
+    return job_df[job_df["id"].isin(matches["id"])]
+
+def batch_create_resumes(return_menu):
+    job_df = jb.load_listing()
+    if job_df.empty:
+        print("No jobs found in the job bank. Please add a job first.")
+        return return_menu()
+
+    print("\n"+"-"*30)
+    print("Here are the jobs currently stored in your job bank:")
+    print(job_df[['title', 'company', 'location']])
+    print("-" * 30 + "\n")
+
+    valid = {
+        '1': {"desc": "Pick jobs by index", "func": _pick_by_index, "args": [job_df]},
+        '2': {"desc": "Filter by company and/or posting date", "func": _pick_by_filter, "args": [job_df]},
+        '3': {"desc": "Return to Analyze Job Menu", "func": cutil.return_self_dummy}
+    }
+    selected = cutil.input_choice("Which jobs would you like to create resumes for?", valid, "Please type 1, 2 or 3")
+    if selected is None:
+        return return_menu()
+    if selected.empty:
+        print("No jobs matched.")
+        return return_menu()
+
+    jobs = [jb.get_job(job_id, ['id', 'title', 'company', 'description']) for job_id in selected["id"]]
+    jobs = [job for job in jobs if job]
+
+    if cutil.input_yes_no(f"Analyzing {len(jobs)} jobs. Use fast selection (keyword ranking, no AI) instead of the model?"):
+        run_fast_batch(jobs)
+        return return_menu()
+
+    concurrency = cutil.input_int(
+        f"How many requests should run at once? (Enter for {DEFAULT_CONCURRENCY}): ",
+        cutil.CommonConstraints.positive_integer, "Please enter a positive number", empty_allowed=True
+    ) or DEFAULT_CONCURRENCY
+
+    run_batch(jobs, concurrency)
+    return return_menu()
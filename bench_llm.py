@@ -0,0 +1,86 @@
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from types import SimpleNamespace
+import fake_ollama
+import streaming
+
+# Offline latency benchmark for the streaming loops in analyzer.py, projects.py and work_experience.py.
+# Starts fake_ollama in-process with a known first token delay and token rate, streams a reply through the same
+# client path the app uses (models.get_chain, i.e. langchain's ChatOllama, read by streaming.consume) and reports
+# time to first token, total time and tokens/sec next to what the script alone should take, so the difference is
+# our own overhead.
+# Falls back to reading the raw http stream when langchain_ollama is not installed.
+#
+# Usage: python bench_llm.py [--runs 5] [--tokens-per-sec 200] [--first-token-delay 0.2] [--raw]
+
+PROMPT = "Job Description: {job_description}\n\nPick the most relevant skills."
+
+def stream_langchain(base_url):
+    import models
+    chain = models.get_chain(PROMPT, models.REASONING_MODEL, streaming=True, reasoning=True, base_url=base_url)
+    return chain.stream({"job_description": "Backend engineer, Python, AWS"})
+
+def stream_raw(base_url):
+    body = json.dumps({
+        "model": "deepseek-r1",
+        "messages": [{"role": "user", "content": PROMPT.format(job_description="Backend engineer, Python, AWS")}],
+        "think": True,
+        "stream": True,
+    }).encode("utf-8")
+    request = urllib.request.Request(f"{base_url}/api/chat", data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        for line in response:
+            message = json.loads(line).get("message", {})
+            # shaped like a langchain chunk so streaming.consume can read it
+            yield SimpleNamespace(content=message.get("content", ""), additional_kwargs={"reasoning_content": message.get("thinking", "")})
+
+def run_once(stream):
+    # the same consumer the app streams through, without printing or writing to the metrics log
+    t_start = time.perf_counter()
+    result = streaming.consume(stream, show_content=False, log=False)
+    total = time.perf_counter() - t_start
+    return result.first_token or total, total, result.tokens, result.text
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM streaming against a local fake Ollama")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--first-token-delay", type=float, default=0.2)
+    parser.add_argument("--script", help='json file with "reasoning" and "content" strings to stream')
+    parser.add_argument("--raw", action="store_true", help="read the http stream directly instead of through langchain")
+    args = parser.parse_args()
+
+    script = fake_ollama.load_script(args.script) if args.script else fake_ollama.DEFAULT_SCRIPT
+    config = fake_ollama.FakeOllamaConfig(args.tokens_per_sec, args.first_token_delay, script=script)
+    server, base_url = fake_ollama.start_server(config=config)
+
+    mode = "raw"
+    if not args.raw:
+        try:
+            import langchain_ollama # noqa: F401
+            mode = "langchain"
+        except ImportError:
+            print("langchain_ollama is not installed, benchmarking the raw http stream instead\n")
+    stream_factory = stream_langchain if mode == "langchain" else stream_raw
+
+    script_tokens = len(fake_ollama.tokenize(script["reasoning"])) + len(fake_ollama.tokenize(script["content"]))
+    expected_total = args.first_token_delay + (script_tokens - 1) / args.tokens_per_sec # first token goes out right after the delay
+
+    results = [run_once(stream_factory(base_url)) for _ in range(args.runs)]
+    server.shutdown()
+
+    ttfts = [result[0] for result in results]
+    totals = [result[1] for result in results]
+    rates = [result[2] / (result[1] - result[0]) for result in results if result[1] > result[0]]
+    print(f"Mode: {mode}, {args.runs} runs, {script_tokens} scripted tokens at {args.tokens_per_sec:g} tok/s")
+    print(f"  time to first token  median {statistics.median(ttfts) * 1000:8.1f} ms  (scripted {args.first_token_delay * 1000:.1f} ms)")
+    print(f"  total                median {statistics.median(totals) * 1000:8.1f} ms  (scripted {expected_total * 1000:.1f} ms)")
+    if rates:
+        print(f"  tokens/sec           median {statistics.median(rates):8.1f}")
+    print(f"  overhead             median {(statistics.median(totals) - expected_total) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import time
+import resume_ga as ga
+import resume_optimizer as ropt
+
+# Throughput benchmark for the genetic resume search.
+# Builds a large synthetic profile (random item texts and relevance scores, nothing is read from Stored Info), runs
+# the search with fitness evaluated in this process and then in a process pool (skipped for --workers 1), and
+# reports generations per second for each, plus the gap between the best genome and the knapsack optimum. As in
+# analyzer.create_resume_variants, the population starts from the optimizer's page. The same seed must give the same
+# best genome either way.
+#
+# Usage: python bench_resume_ga.py [--skills 2000] [--generations 50] [--population 2000] [--workers 0] [--seed 0]
+
+WORDS = "python java sql aws docker kubernetes react machine learning data pipelines backend api design testing linux spark kafka built led improved reduced latency".split()
+
+def synthetic_profile(rng, skills, courses, projects, jobs):
+    def text(low, high):
+        return " ".join(rng.choice(WORDS, size=int(rng.integers(low, high))))
+    sections = {
+        "skills": {i: {"skill_name": str(rng.choice(WORDS)).title(), "level": int(rng.integers(1, 11))} for i in range(skills)},
+        "coursework": {i: {"course_name": f"Course {i}", "institution": "University", "year": 2024, "semester": "Fall", "grade": "A", "description": text(5, 30)} for i in range(courses)},
+        "projects": {i: {"project_name": f"Project {i}", "description": text(10, 60)} for i in range(projects)},
+        "work_experience": {i: {"role": "Engineer", "company": f"Company {i}", "description_short": text(10, 30), "bullet1_long": text(10, 25), "bullet2_long": text(10, 25), "bullet3_long": text(10, 25)} for i in range(jobs)},
+    }
+    scores = ropt.weight_scores({section: {index: float(rng.random()) for index in rows} for section, rows in sections.items()})
+    return sections, scores
+
+def timed_run(problem, args, workers, seed_genomes):
+    t1 = time.perf_counter()
+    population, fitness = ga.evolve(problem, generations=args.generations, population_size=args.population, seed=args.seed, workers=workers, seed_genomes=seed_genomes)
+    return time.perf_counter() - t1, population, fitness
+
+def main():
+    import numpy as np
+
+    parser = argparse.ArgumentParser(description="Benchmark the genetic resume search")
+    parser.add_argument("--skills", type=int, default=2000, help="synthetic skills, the other sections are scaled from this")
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--population", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=0, help="processes for the pool run (0 = one per core)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    sections, scores = synthetic_profile(rng, args.skills, args.skills // 2, args.skills // 2, args.skills // 4)
+    problem = ga.Problem(sections, scores)
+    workers = args.workers or os.cpu_count() or 1
+    print(f"{len(problem.items)} candidate items, population {args.population}, {args.generations} generations")
+
+    t1 = time.perf_counter()
+    optimum = ropt.optimize(sections, scores)
+    print(f"  knapsack optimum      value {optimum['value']:9.2f}  in {(time.perf_counter() - t1) * 1000:.0f} ms")
+    seed_genomes = [ga.encode(problem, optimum["selection"], optimum["forms"])]
+
+    runs = [("in process", 1)] + ([(f"{workers} processes", workers)] if workers > 1 else [])
+    results = {}
+    for label, count in runs:
+        seconds, population, fitness = timed_run(problem, args, count, seed_genomes)
+        results[label] = population[0]
+        best = ga.decode(problem, population[0])
+        gap = 100 * (optimum["value"] - best["value"]) / optimum["value"] if optimum["value"] else 0.0
+        print(f"  {label:<20}  value {best['value']:9.2f}  height {best['height']:6.1f}pt  gap {gap:6.1f}%  {args.generations / seconds:8.1f} generations/s")
+
+    if len(results) > 1:
+        same = all(np.array_equal(genome, results["in process"]) for genome in results.values())
+        print(f"  same best genome for the same seed: {'yes' if same else 'NO'}")
+
+if __name__ == "__main__":
+    main()
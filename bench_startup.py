@@ -0,0 +1,71 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Cold-start benchmark for the main menu.
+# Runs `python -X importtime` in a fresh interpreter and adds up the cumulative time of every top level import,
+# once for `import analyzer` as it is today and once with the heavy dependencies imported up front, the way
+# analyzer.py used to load them at module level.
+#
+# Usage: python bench_startup.py [--runs 5]
+
+# what analyzer.py and the modules it imports loaded at module level before the imports were made lazy. pylatex is
+# not among them, only resume_creation_latex uses it and the menu never imported that
+HEAVY_MODULES = ["pandas", "langchain_ollama", "langchain_core.prompts", "jobspy"]
+
+def import_time_us(statement):
+    """Run statement in a new interpreter and return (total import time in us, {module: cumulative us})"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    top_level = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # nesting is shown by indentation, top level imports have exactly one space after the bar
+        if not name.startswith("  "):
+            top_level[name.strip()] = int(cumulative_us)
+    return sum(top_level.values()), top_level
+
+def available(module):
+    return subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True).returncode == 0
+
+def bench(label, statement, runs):
+    totals = []
+    breakdown = {}
+    for _ in range(runs):
+        total, breakdown = import_time_us(statement)
+        totals.append(total)
+    print(f"{label:<28} median {statistics.median(totals) / 1000:8.1f} ms  (min {min(totals) / 1000:.1f} ms over {runs} runs)")
+    return statistics.median(totals), breakdown
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of analyzer.py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="how many of the slowest top level imports to list")
+    args = parser.parse_args()
+
+    lazy_total, breakdown = bench("import analyzer (lazy)", "import analyzer", args.runs)
+    print("  slowest top level imports:")
+    for name, us in sorted(breakdown.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"    {name:<30} {us / 1000:8.1f} ms")
+
+    heavy = [module for module in HEAVY_MODULES if available(module)]
+    missing = [module for module in HEAVY_MODULES if module not in heavy]
+    if missing:
+        print(f"\nNot installed, left out of the eager comparison: {', '.join(missing)}")
+    if not heavy:
+        return
+
+    eager_statement = "; ".join(f"import {module}" for module in heavy) + "; import analyzer"
+    eager_total, _ = bench("import analyzer (eager)", eager_statement, args.runs)
+    print(f"\nLazy imports save {(eager_total - lazy_total) / 1000:.1f} ms ({eager_total / max(lazy_total, 1):.1f}x faster to the main menu)")
+
+if __name__ == "__main__":
+    main()
@@ -43,7 +43,7 @@ def input_choice(prompt, choices: dict, error_msg=None):
         print("\n")
         return desired_func(*args, **kwargs)
 
-def input_yes_no(prompt, yes_func, no_func, error_msg=None):
+def input_yes_no(prompt, yes_func=None, no_func=None, error_msg=None):
     while True:
         user_input = input(prompt + " (y/n): ").strip().lower()
 
@@ -57,7 +57,9 @@ def input_yes_no(prompt, yes_func, no_func, error_msg=None):
             return no_func() if no_func else False
 
 def return_self_dummy(*args, **kwargs):
-    return args if args else None
+    if not args:
+        return None
+    return args[0] if len(args) == 1 else args # a single choice comes back as itself, e.g. '1' rather than ('1',)
 
 class CommonConstraints:
     @staticmethod
@@ -1,4 +1,4 @@
-import pandas as pd
+import bank_store as bs
 import cli_util as cutil
 from cli_util import CommonConstraints as cc
 def adjust_coursework(adjust_user_info):
@@ -14,7 +14,7 @@ def adjust_coursework(adjust_user_info):
     return cutil.input_choice(prompt, valid, "Please type 1 to view coursework, 2 to add coursework, 3 to remove coursework, 4 to edit coursework, or 5 to return to user info")
 
 def view_coursework():
-    coursework_df = pd.read_csv('Stored Info/coursework_bank.csv')
+    coursework_df = bs.get_bank('coursework_bank.csv')
     print("\n" + "-"*30)
     print(coursework_df)
     print("-"*30 + "\n")
@@ -38,7 +38,7 @@ def add_coursework():
             print("Invalid input. None of the fields can be empty.")
             continue
         
-        if course_id in pd.read_csv('Stored Info/coursework_bank.csv')['course_id'].values:
+        if course_id in bs.get_bank('coursework_bank.csv')['course_id'].values:
             print(f"Course with ID '{course_id}' already exists. Please enter a different course ID.")
             continue
         
@@ -48,23 +48,19 @@ def add_coursework():
         
         semester = semester.upper()
         
-        coursework_df = pd.read_csv('Stored Info/coursework_bank.csv')
-        
-        new_row = pd.DataFrame(
-            {'course_id': [course_id], 
-             'course_name': [course_name], 
-             'institution': [institution], 
-             'year': [year], 
-             'grade': [grade], 
-             'description': [description]})
-        
-        coursework_df = pd.concat([coursework_df, new_row], ignore_index=True)
-        coursework_df.to_csv('Stored Info/coursework_bank.csv', index=False)
+        bs.append_row('coursework_bank.csv',
+            {'course_id': course_id, 
+             'course_name': course_name, 
+             'institution': institution, 
+             'year': year, 
+             'semester': semester, 
+             'grade': grade, 
+             'description': description})
         print(f"Course '{course_id}' added successfully.\n")
 
 def remove_coursework():
     while True:
-        coursework_df = pd.read_csv('Stored Info/coursework_bank.csv')
+        coursework_df = bs.get_bank('coursework_bank.csv')
         
         course_to_remove = input("Enter the course ID to remove (Type back to return to adjusting coursework menu): ")
         
@@ -73,15 +69,14 @@ def remove_coursework():
             return
         
         if course_to_remove in coursework_df['course_id'].values:
-            coursework_df = coursework_df[coursework_df['course_id'] != course_to_remove]
-            coursework_df.to_csv('Stored Info/coursework_bank.csv', index=False)
+            bs.remove_rows('coursework_bank.csv', coursework_df['course_id'] == course_to_remove)
             print(f"Course '{course_to_remove}' removed successfully.")
         else:
             print(f"Course with ID '{course_to_remove}' not found.")
 
 def edit_coursework():
     while True:
-        coursework_df = pd.read_csv('Stored Info/coursework_bank.csv')
+        coursework_df = bs.get_bank('coursework_bank.csv')
         
         course_to_edit = input("Enter the course ID to edit (Type back to return to adjusting coursework menu): ")
         
@@ -98,7 +93,7 @@ def edit_coursework():
             description = cutil.input_str(prompt="Enter a brief new description of the course: ", constraint=cc.non_empty_string, error_msg="Description cannot be empty.")
             
             coursework_df.loc[coursework_df['course_id'] == course_to_edit, ['course_name', 'institution', 'year', 'grade', 'description', 'semester']] = [course_name, institution, year, grade, description, semester ]
-            coursework_df.to_csv('Stored Info/coursework_bank.csv', index=False)
+            bs.mark_dirty('coursework_bank.csv')
             print(f"Course '{course_to_edit}' updated successfully.")
         else:
             print(f"Course with ID '{course_to_edit}' not found.")
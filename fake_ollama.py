@@ -0,0 +1,224 @@
+import argparse
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stand-in for a local Ollama server, for benchmarking the streaming code without a GPU.
+# Speaks enough of the Ollama API for langchain_ollama's ChatOllama: POST /api/chat and /api/generate
+# (streamed as newline delimited json, or a single reply with "stream": false), GET /api/tags and /api/version.
+# Replies are scripted: the "reasoning" text is streamed first (as message.thinking when the request asks to think,
+# inline in <think> tags otherwise, like deepseek-r1 does), then the "content" text, at a fixed token rate after a
+# configurable delay before the first token. Like Ollama, the part of a prompt shared with the model's previous prompt
+# is not evaluated again, prompt_eval_count only counts the rest.
+#
+# Usage: python fake_ollama.py [--port 11434] [--tokens-per-sec 40] [--first-token-delay 0.5] [--script reply.json]
+# then point the app at it with OLLAMA_HOST=http://127.0.0.1:11434
+
+DEFAULT_SCRIPT = {
+    "reasoning": (
+        "The job asks for backend experience with Python and cloud services, so the projects and work experience "
+        "that mention APIs and deployment matter most. Coursework on databases and distributed systems is relevant, "
+        "the rest can be left out to keep the resume to one page."
+    ),
+    "content": (
+        "Based on the job description, these are the most relevant items:\n\n"
+        '{"skills": [0, 1, 2], "projects": [0, 1], "coursework": [0], "work_experience": [0]}\n\n'
+        "The selected skills match the required stack, and both projects show end-to-end backend work."
+    ),
+}
+
+_TOKEN = re.compile(r"\s*\S+|\s+")
+
+def tokenize(text):
+    """Split text into word-sized tokens, keeping the whitespace so the tokens join back to the original"""
+    return _TOKEN.findall(text or "")
+
+def prompt_text(body):
+    text = body.get("prompt", "") or ""
+    for message in body.get("messages", []) or []:
+        text += f"<{message.get('role', '')}>" + (message.get("content", "") or "")
+    return text
+
+class FakeOllamaConfig:
+    def __init__(self, tokens_per_sec=40.0, first_token_delay=0.5, prefill_tokens_per_sec=0.0, script=None, cache_prompts=True):
+        self.tokens_per_sec = tokens_per_sec
+        self.first_token_delay = first_token_delay
+        self.prefill_tokens_per_sec = prefill_tokens_per_sec # 0 disables the prompt size dependent delay
+        self.script = script or DEFAULT_SCRIPT
+        self.cache_prompts = cache_prompts # like Ollama, only evaluate what follows the prefix shared with the last prompt
+        self._last_prompts = {} # model -> last prompt text
+        self._lock = threading.Lock()
+
+    def uncached_tokens(self, model, text):
+        """Return how many prompt tokens have to be evaluated, and remember text as the model's last prompt"""
+        shared = 0
+        with self._lock:
+            if self.cache_prompts:
+                last = self._last_prompts.get(model, "")
+                limit = min(len(last), len(text))
+                while shared < limit and last[shared] == text[shared]:
+                    shared += 1
+            self._last_prompts[model] = text
+        return max(1, (len(text) - shared) // 4) # ~4 characters per token for english text
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = FakeOllamaConfig()
+
+    def log_message(self, format, *args): # keep benchmark output clean
+        pass
+
+    def _send_json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        elif self.path == "/api/tags":
+            self._send_json({"models": [{"name": "deepseek-r1:latest", "model": "deepseek-r1:latest"}, {"name": "gemma3:1b", "model": "gemma3:1b"}]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/api/chat":
+            self._reply(body, chat=True)
+        elif self.path == "/api/generate":
+            self._reply(body, chat=False)
+        elif self.path == "/api/show":
+            self._send_json({"modelfile": "", "parameters": "", "template": "", "details": {}, "capabilities": ["completion", "thinking"]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def _chunk(self, body, chat, content="", thinking="", done=False):
+        chunk = {"model": body.get("model", ""), "created_at": datetime.now(timezone.utc).isoformat(), "done": done}
+        if chat:
+            chunk["message"] = {"role": "assistant", "content": content}
+            if thinking:
+                chunk["message"]["thinking"] = thinking
+        else:
+            chunk["response"] = content
+            if thinking:
+                chunk["thinking"] = thinking
+        return chunk
+
+    def _reply(self, body, chat):
+        config = self.config
+        started = time.perf_counter_ns()
+        think = bool(body.get("think"))
+        prompt_tokens = config.uncached_tokens(body.get("model", ""), prompt_text(body))
+
+        # (field, token) pairs in the order they are streamed
+        reasoning = config.script.get("reasoning", "")
+        content = config.script.get("content", "")
+        if think:
+            tokens = [("thinking", token) for token in tokenize(reasoning)] + [("content", token) for token in tokenize(content)]
+        else:
+            inline = f"<think>\n{reasoning}\n</think>\n\n" if reasoning else ""
+            tokens = [("content", token) for token in tokenize(inline + content)]
+
+        # an empty generate request only loads the model (what a warm-up sends)
+        if not chat and not body.get("prompt"):
+            tokens = []
+
+        delay = config.first_token_delay
+        if config.prefill_tokens_per_sec:
+            delay += prompt_tokens / config.prefill_tokens_per_sec
+        time.sleep(delay)
+        prompt_done = time.perf_counter_ns()
+
+        interval = 1.0 / config.tokens_per_sec if config.tokens_per_sec else 0.0
+        stream = body.get("stream", True)
+        if stream:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+        collected = {"content": [], "thinking": []}
+        next_at = time.perf_counter()
+        for field, token in tokens:
+            if stream:
+                # pace against a schedule rather than sleeping a fixed amount, so write time does not add up
+                now = time.perf_counter()
+                if next_at > now:
+                    time.sleep(next_at - now)
+                next_at += interval
+                try:
+                    self._write_chunk(self._chunk(body, chat, **{field: token}))
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+                    return # the client hung up (e.g. stopped reading early), Ollama stops generating too
+            collected[field].append(token)
+
+        if not stream and interval:
+            time.sleep(interval * len(tokens))
+
+        finished = time.perf_counter_ns()
+        final = self._chunk(body, chat, done=True)
+        final.update({
+            "done_reason": "stop",
+            "total_duration": finished - started,
+            "load_duration": 0,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": prompt_done - started,
+            "eval_count": len(tokens),
+            "eval_duration": finished - prompt_done,
+        })
+        if stream:
+            self._write_chunk(final)
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        else:
+            reply = self._chunk(body, chat, content="".join(collected["content"]), thinking="".join(collected["thinking"]), done=True)
+            reply.update({key: value for key, value in final.items() if key not in reply})
+            self._send_json(reply)
+
+    def _write_chunk(self, payload):
+        data = json.dumps(payload).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+def start_server(port=0, config=None):
+    """Start the fake server in a background thread. Returns (server, base_url), stop it with server.shutdown()"""
+    handler = type("FakeOllamaHandler", (_Handler,), {"config": config or FakeOllamaConfig()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-ollama", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def load_script(path):
+    with open(path, "r", encoding="utf-8") as f:
+        script = json.load(f)
+    return {"reasoning": script.get("reasoning", ""), "content": script.get("content", "")}
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server with scripted, rate limited streaming replies")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--first-token-delay", type=float, default=0.5, help="seconds before the first token")
+    parser.add_argument("--prefill-tokens-per-sec", type=float, default=0.0, help="also delay the first token by prompt size (0 = off)")
+    parser.add_argument("--script", help='json file with "reasoning" and "content" strings to stream')
+    parser.add_argument("--no-prompt-cache", action="store_true", help="evaluate every prompt in full, even the part repeated from the last one")
+    args = parser.parse_args()
+
+    config = FakeOllamaConfig(args.tokens_per_sec, args.first_token_delay, args.prefill_tokens_per_sec, load_script(args.script) if args.script else None, not args.no_prompt_cache)
+    server, base_url = start_server(args.port, config)
+    print(f"Fake Ollama listening on {base_url} (set OLLAMA_HOST={base_url}), Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
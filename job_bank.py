@@ -0,0 +1,348 @@
+import atexit
+import hashlib
+import sqlite3
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import analyzer_util as autil
+import text_codec
+
+# SQLite storage for the job bank.
+# job_bank.csv used to be re-read, concatenated, de-duplicated across every column and rewritten on each search.
+# Jobs now live in 'Stored Info/job_bank.db' keyed on id, so adding listings only touches the new rows.
+# A job_bank.csv mirror in the old format (full text included) is only kept when asked for (analyzer.py --job-csv),
+# since it would hold every posting uncompressed next to the database. Jobs are only ever appended, so keeping it
+# current means appending the rows added since the last export (tracked by rowid).
+#
+# The long free text columns live in their own table (job_text) so listing views, which only show a few short
+# columns, never page through full postings. A single job's text is read by primary key when it is needed.
+# That text is stored zlib compressed against a dictionary trained on the bank's own postings (see text_codec),
+# and only decompressed when it is read.
+
+DB_PATH = Path("Stored Info/job_bank.db")
+CSV_PATH = Path("Stored Info/job_bank.csv")
+
+JOB_COLUMNS = autil.CSV_HEADERS["job_bank.csv"]
+TEXT_COLUMNS = ["description", "company_description"] # stored in job_text
+ROW_COLUMNS = [column for column in JOB_COLUMNS if column not in TEXT_COLUMNS] # stored in jobs
+BOOL_COLUMNS = ["is_remote"] # stored as 1/0
+INDEXED_COLUMNS = ["company", "title", "date_posted", "site"]
+LISTING_COLUMNS = ["id", "title", "company", "location"]
+
+SCHEMA_VERSION = 1 # PRAGMA user_version, for migrating databases made by this version
+
+DICT_MIN_JOBS = 50 # postings needed before a compression dictionary is worth training
+
+# query parameters that only track where a click came from, they never identify the posting (plus every utm_*).
+# Generic names like source, from or ref are left alone, some boards route to the posting with them
+TRACKING_PARAMS = {"gclid", "fbclid", "trk", "refid", "trackingid"}
+
+csv_mirror = False # keep job_bank.csv up to date on checkpoint(), set by analyzer.py --job-csv
+
+_conn = None
+_seen_keys = None # in-memory copy of the job_keys table, loaded on first use
+_dicts = {} # dict_id -> compression dictionary bytes
+
+def connect():
+    """Return the shared connection, creating the schema (and importing job_bank.csv) on first use"""
+    global _conn
+    if _conn is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(DB_PATH)
+        _create_schema(_conn)
+    return _conn
+
+def _quoted(columns, table=None):
+    prefix = f"{table}." if table else ""
+    return ", ".join(f'{prefix}"{column}"' for column in columns)
+
+def _create_jobs_table(conn, name):
+    columns = ",\n    ".join(f'"{column}"' for column in ROW_COLUMNS if column != "id")
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {name} (\n    "id" TEXT PRIMARY KEY NOT NULL,\n    {columns}\n)')
+
+def _create_schema(conn):
+    with conn:
+        _create_jobs_table(conn, "jobs")
+        # dict_id is the text_dicts row the text was compressed with, NULL for no dictionary
+        conn.execute(f'CREATE TABLE IF NOT EXISTS job_text (\n    "id" TEXT PRIMARY KEY NOT NULL,\n    {_quoted(TEXT_COLUMNS)},\n    "dict_id" INTEGER\n)')
+        conn.execute('CREATE TABLE IF NOT EXISTS text_dicts (dict_id INTEGER PRIMARY KEY, data BLOB NOT NULL, trained_on INTEGER NOT NULL)')
+        # dedup index, one row per identifying key (job id, normalized url) of every job ever added
+        conn.execute("CREATE TABLE IF NOT EXISTS job_keys (key TEXT PRIMARY KEY NOT NULL, job_id TEXT NOT NULL) WITHOUT ROWID")
+        # the last jobs rowid written to job_bank.csv, a single row
+        conn.execute("CREATE TABLE IF NOT EXISTS csv_export (id INTEGER PRIMARY KEY CHECK (id = 0), last_rowid INTEGER NOT NULL)")
+
+    with conn:
+        for column in INDEXED_COLUMNS:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_jobs_{column} ON jobs ("{column}")')
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # first run after switching from the csv bank, carry the existing listings over
+    if conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone() is None and CSV_PATH.exists():
+        import pandas as pd
+        csv_df = pd.read_csv(CSV_PATH)
+        if not csv_df.empty:
+            added = insert_jobs(csv_df, conn=conn)
+            _set_exported_rowid(conn, _max_rowid(conn)) # job_bank.csv already holds every row
+            print(f"Imported {added} jobs from {CSV_PATH} into {DB_PATH}")
+
+def _current_dict(conn):
+    row = conn.execute("SELECT dict_id, data FROM text_dicts ORDER BY dict_id DESC LIMIT 1").fetchone()
+    if row is None:
+        return None, None
+    _dicts[row[0]] = row[1]
+    return row
+
+def _get_dict(dict_id):
+    if dict_id is None:
+        return None
+    if dict_id not in _dicts:
+        _dicts[dict_id] = connect().execute("SELECT data FROM text_dicts WHERE dict_id = ?", (dict_id,)).fetchone()[0]
+    return _dicts[dict_id]
+
+def _decode_text(value, dict_id):
+    # plain str values are text written before compression existed
+    if isinstance(value, bytes):
+        return text_codec.decompress(value, _get_dict(dict_id))
+    return value
+
+def _retrain_text_dictionary(conn):
+    """Train a new dictionary on every stored posting and recompress all job text with it"""
+    rows = conn.execute(f'SELECT "id", {_quoted(TEXT_COLUMNS)}, "dict_id" FROM job_text').fetchall()
+    texts = [[_decode_text(value, row[-1]) for value in row[1:-1]] for row in rows]
+    before = sum(len(value) for row in rows for value in row[1:-1] if value is not None)
+
+    zdict = text_codec.train_dictionary(text for row in texts for text in row) if len(rows) >= DICT_MIN_JOBS else None
+    with conn:
+        dict_id = None
+        if zdict:
+            dict_id = conn.execute("INSERT INTO text_dicts (data, trained_on) VALUES (?, ?)", (zdict, len(rows))).lastrowid
+            _dicts[dict_id] = zdict
+        updates = [[text_codec.compress(text, zdict) for text in row_texts] + [dict_id, row[0]] for row, row_texts in zip(rows, texts)]
+        assignments = ", ".join(f'"{column}" = ?' for column in TEXT_COLUMNS)
+        conn.executemany(f'UPDATE job_text SET {assignments}, "dict_id" = ? WHERE "id" = ?', updates)
+        # older dictionaries are no longer referenced by any row
+        conn.execute("DELETE FROM text_dicts WHERE dict_id NOT IN (SELECT DISTINCT dict_id FROM job_text WHERE dict_id IS NOT NULL)")
+
+    after = sum(len(value) for update in updates for value in update[:-2] if value is not None)
+    print(f"Compressed job descriptions: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB")
+
+def _maybe_retrain(conn):
+    # train once the bank is big enough, then again every time it doubles so the dictionary tracks the postings
+    count = conn.execute("SELECT COUNT(*) FROM job_text").fetchone()[0]
+    row = conn.execute("SELECT trained_on FROM text_dicts ORDER BY dict_id DESC LIMIT 1").fetchone()
+    if (row is None and count >= DICT_MIN_JOBS) or (row is not None and count >= 2 * row[0]):
+        _retrain_text_dictionary(conn)
+
+def _to_sql_value(value):
+    if value is None:
+        return None
+    if getattr(value, "ndim", None) == 0: # numpy scalars
+        value = value.item()
+    if isinstance(value, float) and value != value: # NaN
+        return None
+    if isinstance(value, (str, int, float)):
+        return value
+    return str(value) # lists, dates, etc. are stored the same way to_csv would have written them
+
+def _text_value(value):
+    value = _to_sql_value(value)
+    return None if value is None else str(value)
+
+def _fallback_id(row):
+    url = _to_sql_value(row.get("job_url_direct")) or _to_sql_value(row.get("job_url")) or ""
+    return "url-" + hashlib.sha1(str(url).encode("utf-8")).hexdigest()[:16]
+
+def normalize_url(url):
+    """Reduce a job url to the parts that identify the posting (no scheme, www., tracking params or fragment)"""
+    url = _to_sql_value(url)
+    if not url or not str(url).strip():
+        return None
+    parts = urlsplit(str(url).strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith("utm_")
+    )
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{urlencode(query)}" if query else "")
+
+def job_keys(job_id, job_url=None, job_url_direct=None):
+    """Return every dedup key for a job: its id plus a hash of each normalized url"""
+    keys = []
+    job_id = _to_sql_value(job_id)
+    if job_id is not None:
+        keys.append(f"id:{job_id}")
+    for url in (job_url, job_url_direct):
+        normalized = normalize_url(url)
+        if normalized:
+            key = "url:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+            if key not in keys:
+                keys.append(key)
+    return keys
+
+def _load_seen_keys():
+    global _seen_keys
+    if _seen_keys is None:
+        _seen_keys = {key for (key,) in connect().execute("SELECT key FROM job_keys")}
+    return _seen_keys
+
+def filter_new_jobs(job_df):
+    """
+    Drop rows of job_df that are already in the bank, or repeat an earlier row of job_df, matching on job id or url.
+    Returns (new_jobs_df, number_of_skipped_rows)
+    """
+    seen = _load_seen_keys()
+    batch_keys = set()
+    keep = []
+    for record in job_df.to_dict(orient="records"):
+        keys = job_keys(record.get("id"), record.get("job_url"), record.get("job_url_direct"))
+        is_new = not any(key in seen or key in batch_keys for key in keys)
+        keep.append(is_new)
+        if is_new:
+            batch_keys.update(keys)
+
+    new_df = job_df[keep].copy() # a copy, so callers can fill in columns (e.g. skills) before inserting
+    return new_df, len(job_df) - len(new_df)
+
+def insert_jobs(job_df, conn=None):
+    """Insert the rows of job_df that are not in the bank yet. Returns the number of rows added"""
+    conn = conn or connect()
+
+    dict_id, zdict = _current_dict(conn)
+    rows = []
+    text_rows = []
+    key_rows = []
+    for record in job_df.to_dict(orient="records"):
+        values = [_to_sql_value(record.get(column)) for column in ROW_COLUMNS]
+        if values[0] is None:
+            values[0] = _fallback_id(record)
+        job_id = values[0]
+        rows.append(values)
+        text_rows.append([job_id] + [text_codec.compress(_text_value(record.get(column)), zdict) for column in TEXT_COLUMNS] + [dict_id])
+        key_rows.extend((key, job_id) for key in job_keys(job_id, record.get("job_url"), record.get("job_url_direct")))
+
+    with conn:
+        before = conn.total_changes
+        conn.executemany(f"INSERT OR IGNORE INTO jobs ({_quoted(ROW_COLUMNS)}) VALUES ({', '.join('?' for _ in ROW_COLUMNS)})", rows)
+        added = conn.total_changes - before
+        conn.executemany(f"INSERT OR IGNORE INTO job_text ({_quoted(['id'] + TEXT_COLUMNS + ['dict_id'])}) VALUES ({', '.join('?' for _ in range(len(TEXT_COLUMNS) + 2))})", text_rows)
+        conn.executemany("INSERT OR IGNORE INTO job_keys (key, job_id) VALUES (?, ?)", key_rows)
+
+    if _seen_keys is not None:
+        _seen_keys.update(key for key, _ in key_rows)
+
+    if added:
+        _maybe_retrain(conn)
+    return added
+
+def _select(columns):
+    # only join job_text when a text column was actually asked for, the dict_id needed to decode it comes last
+    selected = ", ".join(f'{"t" if column in TEXT_COLUMNS else "j"}."{column}"' for column in columns)
+    if any(column in TEXT_COLUMNS for column in columns):
+        return f'SELECT {selected}, t."dict_id" FROM jobs j LEFT JOIN job_text t ON t."id" = j."id"'
+    return f"SELECT {selected} FROM jobs j"
+
+def _fetch(sql, params, columns):
+    text_positions = [position for position, column in enumerate(columns) if column in TEXT_COLUMNS]
+    for row in connect().execute(sql, params):
+        if not text_positions:
+            yield row
+            continue
+        row = list(row)
+        dict_id = row.pop()
+        for position in text_positions:
+            row[position] = _decode_text(row[position], dict_id)
+        yield row
+
+def load_jobs(columns=None):
+    """Return the job bank as a DataFrame, optionally reading only the given columns"""
+    import pandas as pd
+    columns = columns or JOB_COLUMNS
+    return pd.DataFrame(list(_fetch(_select(columns) + " ORDER BY j.rowid", (), columns)), columns=columns)
+
+def load_listing():
+    """Return just the columns shown when picking a job (id, title, company, location)"""
+    return load_jobs(LISTING_COLUMNS)
+
+def find_jobs(company=None, posted_since=None, columns=None):
+    """
+    Return the jobs whose company contains `company` (case insensitive) and that were posted on or after
+    `posted_since` (YYYY-MM-DD), as a DataFrame. Either filter can be left out.
+    """
+    import pandas as pd
+    columns = columns or LISTING_COLUMNS
+    conditions, params = [], []
+    if company:
+        conditions.append('j."company" LIKE ?')
+        params.append(f"%{company}%")
+    if posted_since:
+        conditions.append('j."date_posted" >= ?')
+        params.append(str(posted_since))
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return pd.DataFrame(list(_fetch(_select(columns) + where + " ORDER BY j.rowid", params, columns)), columns=columns)
+
+def get_job(job_id, columns=None):
+    """Return a single job as a dict, or None if there is no job with that id"""
+    columns = columns or JOB_COLUMNS
+    row = next(_fetch(_select(columns) + ' WHERE j."id" = ?', (job_id,), columns), None)
+    return dict(zip(columns, row)) if row else None
+
+def get_jobs(job_ids, columns=None, batch_size=500):
+    """Yield the given jobs as dicts, reading (and decompressing) batch_size of them at a time"""
+    columns = columns or JOB_COLUMNS
+    job_ids = list(job_ids)
+    for first in range(0, len(job_ids), batch_size):
+        batch = job_ids[first:first + batch_size]
+        sql = _select(columns) + f' WHERE j."id" IN ({", ".join("?" for _ in batch)}) ORDER BY j.rowid'
+        for row in _fetch(sql, batch, columns):
+            yield dict(zip(columns, row))
+
+def count_jobs():
+    return connect().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+def _max_rowid(conn):
+    return conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM jobs").fetchone()[0]
+
+def _exported_rowid(conn):
+    row = conn.execute("SELECT last_rowid FROM csv_export WHERE id = 0").fetchone()
+    return None if row is None else row[0]
+
+def _set_exported_rowid(conn, rowid):
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO csv_export (id, last_rowid) VALUES (0, ?)", (rowid,))
+
+def _load_rows(first_rowid, last_rowid):
+    import pandas as pd
+    sql = _select(JOB_COLUMNS) + " WHERE j.rowid > ? AND j.rowid <= ? ORDER BY j.rowid"
+    df = pd.DataFrame(list(_fetch(sql, (first_rowid, last_rowid), JOB_COLUMNS)), columns=JOB_COLUMNS)
+    # sqlite has no bool type, write them the way the csv bank did
+    for column in BOOL_COLUMNS:
+        df[column] = df[column].map(lambda value: bool(value) if value in (0, 1) else value)
+    return df
+
+def export_csv(path=CSV_PATH):
+    """Write the whole job bank out in the job_bank.csv format"""
+    conn = connect()
+    newest = _max_rowid(conn)
+    _load_rows(0, newest).to_csv(path, index=False)
+    if Path(path) == CSV_PATH:
+        _set_exported_rowid(conn, newest)
+
+def checkpoint():
+    """Bring job_bank.csv up to date if the bank has jobs it does not, appending only the new rows"""
+    if not csv_mirror:
+        return
+    conn = connect()
+    last = _exported_rowid(conn)
+    if last is None or not CSV_PATH.exists():
+        # never exported from this database, write it out once
+        export_csv()
+        return
+    # also catches rows added by earlier runs without --job-csv
+    newest = _max_rowid(conn)
+    if newest > last:
+        _load_rows(last, newest).to_csv(CSV_PATH, mode="a", header=False, index=False)
+        _set_exported_rowid(conn, newest)
+
+atexit.register(checkpoint)
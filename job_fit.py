@@ -0,0 +1,197 @@
+import hashlib
+import json
+import math
+import time
+from collections import Counter
+from pathlib import Path
+import bank_store as bs
+import job_bank as jb
+import retrieval
+import skill_aliases
+
+# How well every job in the job bank fits the profile, to decide which listings are worth targeting.
+# The profile side is built once: which terms make up each spelling of each skill name, and one term vector for all
+# coursework and project text. The job side is kept as coordinate arrays (job, term, count) over the profile's terms
+# only, as in ranking.py, so a batch of jobs is scored with a few gathers and bincounts and never as a dense
+# jobs x terms matrix:
+#   skill fit: a skill matches a job when every token of one of its spellings (see skill_aliases) appears in the
+#              posting, worth level / MAX_LEVEL
+#   text fit:  cosine similarity between the posting and the coursework and project text, times TEXT_WEIGHT
+# A job's score only depends on its own text and the profile, and stored postings are never changed (see
+# job_bank.insert_jobs), so results are cached per job id (Cache/job_fit.json) and only new jobs are read and
+# scored. Any change to the skills, coursework or projects banks invalidates the whole cache.
+
+CACHE_PATH = Path("Cache") / "job_fit.json"
+CACHE_VERSION = 2 # 2: entries keyed on job id alone
+
+MAX_LEVEL = 10 # skill levels run from 1 to 10
+TEXT_WEIGHT = 5.0 # a posting that reads exactly like the coursework and projects counts as much as five master level skills
+TOP_SKILLS = 5 # matching skills kept per job, strongest first
+BATCH_SIZE = 500 # jobs read and scored at a time
+
+def _hash(text):
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+class Profile:
+    def __init__(self, skills, texts):
+        """skills: [(skill name, level)], texts: coursework and project descriptions"""
+        import numpy as np
+
+        self.vocabulary = {}
+        # the token sets of every spelling of each skill
+        skill_spellings = [[sorted(set(retrieval.tokenize(spelling))) for spelling in skill_aliases.search_spellings(name)] for name, _ in skills]
+        skill_spellings = [[tokens for tokens in spellings if tokens] for spellings in skill_spellings]
+        text_counts = Counter(token for text in texts for token in retrieval.tokenize(text))
+        for tokens in [tokens for spellings in skill_spellings for tokens in spellings] + [list(text_counts)]:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        # keep only the skills with at least one searchable spelling
+        kept = [position for position, spellings in enumerate(skill_spellings) if spellings]
+        self.skill_names = [skills[position][0] for position in kept]
+        self.levels = np.array([float(skills[position][1]) for position in kept]) / MAX_LEVEL
+        spellings = [(row, tokens) for row, position in enumerate(kept) for tokens in skill_spellings[position]]
+        self.spelling_skills = np.array([row for row, _ in spellings], dtype=np.int64) # the skill each spelling is
+        self.spelling_lengths = np.array([len(tokens) for _, tokens in spellings], dtype=np.int64)
+        # for every term, the spellings that contain it: term_spellings[term_starts[t]:term_starts[t + 1]]
+        pairs = sorted((self.vocabulary[token], number) for number, (_, tokens) in enumerate(spellings) for token in tokens)
+        self.term_spellings = np.array([number for _, number in pairs], dtype=np.int64)
+        self.term_starts = np.searchsorted(np.array([term for term, _ in pairs], dtype=np.int64), np.arange(len(self.vocabulary) + 1))
+
+        self.text_vector = np.zeros(len(self.vocabulary))
+        for token, count in text_counts.items():
+            self.text_vector[self.vocabulary[token]] = 1 + math.log(count)
+        norm = np.linalg.norm(self.text_vector)
+        if norm:
+            self.text_vector /= norm
+
+        self.key = _hash(json.dumps([skills, skill_spellings, sorted(texts)], default=str))
+
+    def score(self, descriptions):
+        """
+        Score a list of job descriptions. Returns (fit, skill fit, text fit) arrays and the matching skill names of
+        each job, strongest first.
+        """
+        import numpy as np
+
+        rows, terms, counts = [], [], []
+        norms = np.ones(len(descriptions))
+        for row, description in enumerate(descriptions):
+            job_counts = Counter(retrieval.tokenize(description or ""))
+            # the cosine needs the length of the whole posting, not just the part that shares terms with the profile
+            norms[row] = math.sqrt(sum((1 + math.log(count)) ** 2 for count in job_counts.values())) or 1
+            for token, count in job_counts.items():
+                term = self.vocabulary.get(token)
+                if term is not None:
+                    rows.append(row)
+                    terms.append(term)
+                    counts.append(count)
+        rows = np.asarray(rows, dtype=np.int64)
+        terms = np.asarray(terms, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.float64)
+
+        weights = (1 + np.log(counts)) * self.text_vector[terms] if len(terms) else np.zeros(0)
+        text_fit = TEXT_WEIGHT * np.bincount(rows, weights=weights, minlength=len(descriptions)) / norms
+
+        # every (job, spelling) pair a job term takes part in, counted: a spelling matches when all its terms were seen
+        per_term = self.term_starts[terms + 1] - self.term_starts[terms]
+        offsets = np.arange(per_term.sum()) - np.repeat(np.cumsum(per_term) - per_term, per_term)
+        pair_spellings = self.term_spellings[np.repeat(self.term_starts[terms], per_term) + offsets]
+        n_spellings = max(len(self.spelling_lengths), 1)
+        pairs, hits = np.unique(np.repeat(rows, per_term) * n_spellings + pair_spellings, return_counts=True)
+        pairs = pairs[hits == self.spelling_lengths[pairs % n_spellings]]
+
+        # several spellings of one skill count once
+        n_skills = max(len(self.skill_names), 1)
+        matched = np.unique((pairs // n_spellings) * n_skills + self.spelling_skills[pairs % n_spellings])
+        matched_rows, matched_skills = matched // n_skills, matched % n_skills
+        skill_fit = np.bincount(matched_rows, weights=self.levels[matched_skills], minlength=len(descriptions))
+
+        top_skills = [[] for _ in descriptions]
+        for position in np.lexsort((-self.levels[matched_skills], matched_rows)): # by job, strongest skill first
+            job_skills = top_skills[matched_rows[position]]
+            if len(job_skills) < TOP_SKILLS:
+                job_skills.append(self.skill_names[matched_skills[position]])
+        return skill_fit + text_fit, skill_fit, text_fit, top_skills
+
+def load_profile():
+    skills_df = bs.get_bank("skills_bank.csv")
+    skills = [(str(name), int(level)) for name, level in zip(skills_df["skill_name"], skills_df["level"]) if isinstance(name, str)]
+    texts = []
+    for section in ["coursework", "projects"]:
+        rows = bs.get_bank(f"{section}_bank.csv").to_dict(orient="index")
+        texts.extend(retrieval.item_text(section, row) for row in rows.values())
+    return Profile(skills, texts)
+
+def _load_cache():
+    try:
+        return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_PATH.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(cache), encoding="utf-8")
+    tmp_path.replace(CACHE_PATH)
+
+def rank_jobs(profile=None):
+    """
+    Score every job in the job bank, reusing the cached scores of jobs scored before.
+    Returns (results best first, number of jobs scored this time), each result a dict with id, title, company, fit,
+    skill_fit, text_fit and top_skills.
+    """
+    profile = profile or load_profile()
+    cache = _load_cache()
+    if cache.get("profile") != profile.key or cache.get("version") != CACHE_VERSION:
+        cache = {"version": CACHE_VERSION, "profile": profile.key, "jobs": {}}
+
+    # only the short columns are read for every job, the text only for jobs not scored before
+    jobs = jb.load_jobs(["id", "title", "company"])
+    results, stale = {}, []
+    for job_id, title, company in jobs.itertuples(index=False):
+        entry = cache["jobs"].get(job_id)
+        if entry:
+            results[job_id] = {"id": job_id, "title": title, "company": company, **entry}
+        else:
+            stale.append(job_id)
+
+    def score_batch(batch):
+        fit, skill_fit, text_fit, top_skills = profile.score([job["description"] for job in batch])
+        for number, job in enumerate(batch):
+            scores = {"fit": float(fit[number]), "skill_fit": float(skill_fit[number]), "text_fit": float(text_fit[number]), "top_skills": top_skills[number]}
+            cache["jobs"][job["id"]] = scores
+            results[job["id"]] = {"id": job["id"], "title": job["title"], "company": job["company"], **scores}
+
+    batch = []
+    for job in jb.get_jobs(stale, ["id", "title", "company", "description"], BATCH_SIZE):
+        batch.append(job)
+        if len(batch) == BATCH_SIZE:
+            score_batch(batch)
+            batch = []
+    if batch:
+        score_batch(batch)
+
+    # forget jobs that are no longer in the bank
+    cache["jobs"] = {job_id: entry for job_id, entry in cache["jobs"].items() if job_id in results}
+    if stale or len(cache["jobs"]) != len(results):
+        _save_cache(cache)
+    return sorted(results.values(), key=lambda result: result["fit"], reverse=True), len(stale)
+
+def show_ranking(return_menu):
+    if jb.count_jobs() == 0:
+        print("No jobs found in the job bank. Please add a job first.")
+        return return_menu()
+
+    t1 = time.time()
+    ranked, scored = rank_jobs()
+    print(f"\nRanked {len(ranked)} jobs ({scored} scored, {len(ranked) - scored} from cache) in {time.time() - t1:.2f}s\n")
+
+    count = min(len(ranked), 25)
+    print(f"{'#':>3}  {'Fit':>5}  {'Skills':>6}  {'Text':>5}  Job")
+    for place, result in enumerate(ranked[:count], start=1):
+        print(f"{place:>3}  {result['fit']:5.1f}  {result['skill_fit']:6.1f}  {result['text_fit']:5.1f}  {result['title']} at {result['company']}")
+        print(f"{'':>25}Top skills: {', '.join(result['top_skills']) or '(none)'}")
+    if len(ranked) > count:
+        print(f"\n... and {len(ranked) - count} more")
+    return return_menu()
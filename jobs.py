@@ -1,26 +1,44 @@
-import pandas as pd
-from pathlib import Path
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate
-from jobspy import scrape_jobs
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime
+import job_bank as jb
+import models
+import skill_extractor as sx
 import cli_util as cutil
 from cli_util import CommonConstraints as cc
 
+# job boards searched by job_scraper, each one in its own thread
+SITES = ["indeed", "linkedin", "zip_recruiter", "google"]
+
 def add_job(main_menu):
+    models.warm_up_async(models.AUTOCOMPLETE_MODEL) # writes the search queries for a job search
+    
     valid = {
-        '1': {"desc": "Job Search", "func": job_scraper}, 
-        '2': {"desc": "Custom Job Description", "func": custom_job_description}, 
+        '1': {"desc": "Job Search", "func": job_scraper, "args": [main_menu]}, 
+        '2': {"desc": "Custom Job Description", "func": custom_job_description, "args": [main_menu]}, 
         '3': {"desc": "Return to Main Menu", "func": main_menu}
     }
     prompt = "Would you like to perform a job search across job boards, input a custom job description, or return to the main menu?"
     
     return cutil.input_choice(prompt, valid, "Please type 1 to perform a job search, 2 to input a custom job description, or 3 to return to the main menu")
 
-def job_scraper():
+def _scrape_site(scrape_jobs, site, **search):
+    t1 = time.time()
+    return scrape_jobs(site_name=[site], **search), time.time() - t1
+
+def _scrape_google(scrape_jobs, autocomplete_model, prompt, **search):
+    # google is the only board that needs the model to write its query, so it waits for that on its own thread
+    google_search_query = autocomplete_model.invoke(prompt).content.strip()
+    print(f"Generated Google Search Query: {google_search_query}\n")
+    return _scrape_site(scrape_jobs, "google", google_search_term=google_search_query, **search)
+
+def job_scraper(main_menu):
     print("Please wait, initializing searcher...")
+    # jobspy and pandas are only needed once a search actually runs
+    import pandas as pd
+    from jobspy import scrape_jobs
     
-    autocomplete_model = ChatOllama(model="gemma3:1b")
+    autocomplete_model = models.get_model(models.AUTOCOMPLETE_MODEL)
     
     while True:
         search_query = input("Enter the job title or keywords to search for: ")
@@ -44,48 +62,56 @@ def job_scraper():
         formatted_prompt = generate_google_search_prompt.format(
             search_query=search_query,
             location=location,
-            distance=distance,
+            distance=distance if distance is not None else "",
             job_type=job_type
         ).strip()
 
-        google_search_query = autocomplete_model.invoke(formatted_prompt)
-        
-        print(f"Generated Google Search Query: {google_search_query.content.strip()}\n")
-        
-        job_listings = scrape_jobs(
-            site_name=["indeed", "linkedin", "zip_recruiter", "google"],
-            search_query=search_query,
-            location=location,
-            results_wanted=int(num_results),
-            distance=int(distance) if distance.strip() != "" else None,
-            job_type=job_type.lower() if job_type.strip() != "" else None,
-            remote=True if remote.lower() == 'y' else False if remote.lower() == 'n' else None,
-            convert_to_annual=True,
-            verbose=1,
-            linkedin_fetch_description = True,
-            google_search_term=google_search_query.content.strip()
-        )
-        
-        job_result_df = pd.DataFrame(job_listings)
-        print("RESULTS:\n" + "-"*30)
-        print(job_result_df)
-        print("-"*30 + "\n")
-        
-        job_df = pd.read_csv('Stored Info/job_bank.csv')
-        job_df = pd.concat([job_df, job_result_df], ignore_index=True)
+        search = {
+            "search_query": search_query,
+            "location": location,
+            "results_wanted": int(num_results),
+            "distance": distance,
+            "job_type": job_type.lower() if job_type.strip() != "" else None,
+            "remote": True if remote.lower() == 'y' else False if remote.lower() == 'n' else None,
+            "convert_to_annual": True,
+            "verbose": 1,
+            "linkedin_fetch_description": True,
+        }
         
-        job_df = job_df.drop_duplicates()
+        # every board is searched at once and its listings saved as soon as it answers, so a slow or rate limited
+        # board (or google, waiting for its query) only holds up itself. The job bank is only written from this thread
+        t1 = time.time()
+        total_found = total_added = total_skipped = 0
+        with ThreadPoolExecutor(max_workers=len(SITES), thread_name_prefix="job-scraper") as executor:
+            futures = {executor.submit(_scrape_site, scrape_jobs, site, **search): site for site in SITES if site != "google"}
+            if "google" in SITES:
+                futures[executor.submit(_scrape_google, scrape_jobs, autocomplete_model, formatted_prompt, **search)] = "google"
+            for future in as_completed(futures):
+                site = futures[future]
+                try:
+                    job_result_df, seconds = future.result()
+                except Exception as e:
+                    print(f"{site}: failed after {time.time() - t1:.1f}s ({e})")
+                    continue
+                
+                job_result_df = pd.DataFrame(job_result_df)
+                found = len(job_result_df)
+                job_result_df, skipped = jb.filter_new_jobs(job_result_df)
+                filled, megabytes, extract_seconds = sx.fill_skills(job_result_df)
+                added = jb.insert_jobs(job_result_df)
+                total_found, total_added, total_skipped = total_found + found, total_added + added, total_skipped + skipped
+                print(f"{site}: {found} listings in {seconds:.1f}s, {added} new, skipped {skipped} duplicates, found skills in {filled} ({megabytes:.2f} MB at {megabytes / max(extract_seconds, 1e-9):.1f} MB/s)")
         
-        path = Path("Stored Info/job_bank.csv")
-        job_df.to_csv(path, index=False)
-        print(f"Job search bank updated")
+        print(f"\nJob search bank updated ({total_added} new listings out of {total_found}, skipped {total_skipped} duplicates) in {time.time() - t1:.1f}s")
         
         print("\nWould you like to perform another job search? (y / anything else to return to job addition menu)")
         again = input("Selection: ")
         if again.lower() != 'y':
-            return add_job()
+            return add_job(main_menu)
 
-def custom_job_description():
+def custom_job_description(main_menu):
+    import pandas as pd
+    
     while True:
         print("\n"+"-"*30)
         print("You will be asked to input several fields. If you do not have a field, just leave it blank and press enter.")
@@ -96,7 +122,7 @@ def custom_job_description():
         company = input("Enter the company name: ")
         location = input("Enter the job location: ")
         description = input("Enter the job description: ")
-        skills = input("Enter the required skills (comma separated): ")
+        skills = input("Enter the required skills (comma separated, leave blank to find them in the description): ")
         type_of_salary = input("Enter the type of salary (e.g., hourly, yearly): ")
         min_salary = cutil.input_int(prompt="Enter the minimum salary amount: ", constraint=cc.non_negative_integer, error_msg="Please enter a non-negative salary or leave blank.", empty_allowed=True)
         max_salary = cutil.input_int(prompt="Enter the maximum salary amount: ", constraint=cc.non_negative_integer, error_msg="Please enter a non-negative salary or leave blank.", empty_allowed=True)
@@ -133,7 +159,7 @@ def custom_job_description():
             "company_num_employees": None,
             "company_revenue": None,
             "company_description": None,
-            "skills": [s.strip() for s in skills.split(",")],
+            "skills": [s.strip() for s in skills.split(",") if s.strip()],
             "experience_range": None,
             "company_rating": None,
             "company_reviews_count": None,
@@ -141,17 +167,16 @@ def custom_job_description():
             "work_from_home_type": None
         }
         
-        job_df = pd.read_csv('Stored Info/job_bank.csv')
-        job_df = pd.concat([job_df, pd.DataFrame([new_job_entry])], ignore_index=True)
-        
-        job_df = job_df.drop_duplicates()
-            
-        path = Path("Stored Info/job_bank.csv")
-        job_df.to_csv(path, index=False)
-        print(f"Job search bank updated")
+        new_job_df, skipped = jb.filter_new_jobs(pd.DataFrame([new_job_entry]))
+        sx.fill_skills(new_job_df)
+        if skipped:
+            print("This job is already in the job bank, skipping.")
+        else:
+            jb.insert_jobs(new_job_df)
+            print(f"Job search bank updated")
             
         print("\nWould you like to input another job? (y / anything else to return to job addition menu)")
         again = input("Selection: ")
         if again.lower() != 'y':
-            return add_job()
+            return add_job(main_menu)
 
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Persistent cache of final LLM answers.
+# Keyed on the model, the prompt template and a hash of the rendered inputs, so re-running a generation with the
+# same job and unchanged banks returns the earlier answer immediately instead of waiting minutes for the model.
+# Least recently used entries are evicted once the cache grows past MAX_ENTRIES or MAX_BYTES.
+
+CACHE_PATH = Path("Cache") / "llm_cache.db"
+MAX_ENTRIES = 500
+MAX_BYTES = 50 * 1024 * 1024
+
+enabled = True # set to False (analyzer.py --no-llm-cache) to always ask the model
+
+_conn = None
+_lock = threading.Lock() # batch analysis reads and writes from worker threads
+
+def _connect():
+    global _conn
+    if _conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        with _conn:
+            _conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY NOT NULL, model TEXT NOT NULL, response TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            _conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+    return _conn
+
+def make_key(model, template, inputs):
+    # default=str covers timestamps and other non-json values that can come out of the banks
+    rendered = json.dumps({"model": model, "template": template, "inputs": inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(rendered.encode("utf-8")).hexdigest()
+
+def get(model, template, inputs):
+    """Return the cached answer for this exact prompt, or None"""
+    if not enabled:
+        return None
+    key = make_key(model, template, inputs)
+    with _lock:
+        conn = _connect()
+        row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with conn:
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+    return row[0]
+
+def put(model, template, inputs, response):
+    if not enabled or not response:
+        return
+    key = make_key(model, template, inputs)
+    now = time.time()
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode("utf-8")), now, now)
+            )
+            _evict(conn)
+
+def _evict(conn):
+    count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+    if count <= MAX_ENTRIES and total <= MAX_BYTES:
+        return
+    # walk from least to most recently used until both limits hold again
+    doomed = []
+    for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+        if count <= MAX_ENTRIES and total <= MAX_BYTES:
+            break
+        doomed.append((key,))
+        count -= 1
+        total -= size
+    conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+def clear():
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("DELETE FROM responses")
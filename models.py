@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+import time
+import urllib.request
+
+# Registry of Ollama chat clients shared by every AI feature.
+# Each (model, options) pair is created once per process, so its HTTP connection pool is reused between calls,
+# and keep_alive asks Ollama to keep the model loaded between requests instead of unloading it after 5 minutes.
+
+REASONING_MODEL = "deepseek-r1" # resume selection, project and work experience writers
+AUTOCOMPLETE_MODEL = "gemma3:1b" # google search query generation in the job scraper
+
+KEEP_ALIVE = "30m"
+
+_models = {} # (model, options) -> ChatOllama
+_chains = {} # (template, model, options) -> prompt | model
+init_times = {} # (model, options) -> seconds it took to create the client the first time
+warm_up_times = {} # model -> seconds Ollama took to load it for warm_up, None if the request failed
+_warm_ups = {} # model -> warm-up thread, so each model is only preloaded once per session
+
+def _key(model, options):
+    return (model, tuple(sorted(options.items())))
+
+def get_model(model, **options):
+    """Return the shared ChatOllama client for model, creating it on first use"""
+    key = _key(model, options)
+    if key not in _models:
+        from langchain_ollama import ChatOllama
+        t1 = time.time()
+        _models[key] = ChatOllama(model=model, keep_alive=KEEP_ALIVE, **options)
+        init_times[key] = time.time() - t1
+    return _models[key]
+
+def get_prompt(template):
+    """
+    template is either a single string (sent as one user message) or a tuple of (role, text) pairs,
+    e.g. (("system", ...), ("human", ...))
+    """
+    from langchain_core.prompts import ChatPromptTemplate
+    if isinstance(template, str):
+        return ChatPromptTemplate.from_template(template)
+    return ChatPromptTemplate.from_messages(list(template))
+
+def get_chain(template, model, **options):
+    """Return the shared `get_prompt(template) | model` chain"""
+    key = (template,) + _key(model, options)
+    if key not in _chains:
+        _chains[key] = get_prompt(template) | get_model(model, **options)
+    return _chains[key]
+
+def is_loaded(model, **options):
+    return _key(model, options) in _models
+
+def ollama_url(base_url=None):
+    host = base_url or os.environ.get("OLLAMA_HOST") or "127.0.0.1:11434"
+    if "://" not in host:
+        host = "http://" + host
+    return host.rstrip("/").replace("://0.0.0.0", "://127.0.0.1")
+
+def warm_up(model, base_url=None, timeout=600):
+    """
+    Ask Ollama to load model into memory without generating anything (a generate request with no prompt), keeping it
+    loaded for KEEP_ALIVE. Returns the seconds it took, or None if Ollama could not be reached.
+    """
+    body = json.dumps({"model": model, "keep_alive": KEEP_ALIVE, "stream": False}).encode("utf-8")
+    request = urllib.request.Request(f"{ollama_url(base_url)}/api/generate", data=body, headers={"Content-Type": "application/json"})
+    t1 = time.time()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+    except OSError: # Ollama not running or model not pulled, the real request will report it properly
+        warm_up_times[model] = None
+        return None
+    warm_up_times[model] = time.time() - t1
+    return warm_up_times[model]
+
+def warm_up_async(*model_names, base_url=None):
+    """Start loading each model in a background thread so the load overlaps with the user typing. Only once per model"""
+    for model in model_names:
+        if model in _warm_ups:
+            continue
+        thread = threading.Thread(target=warm_up, args=(model, base_url), name=f"warm-up-{model}", daemon=True)
+        _warm_ups[model] = thread
+        thread.start()
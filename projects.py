@@ -1,7 +1,7 @@
-import pandas as pd
 import time
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate
+import bank_store as bs
+import models
+import streaming
 import cli_util as cutil
 from cli_util import CommonConstraints as cc
 
@@ -18,13 +18,15 @@ def adjust_projects(adjust_user_info):
     return cutil.input_choice(prompt, valid, "Please type 1 to view projects, 2 to add a project, 3 to remove a project, 4 to edit a project, or 5 to return to user info")
 
 def view_projects():
-    projects_df = pd.read_csv('Stored Info/projects_bank.csv')
+    projects_df = bs.get_bank('projects_bank.csv')
     print("\n" + "-"*30)
     print(projects_df)
     print("-"*30 + "\n")
     adjust_projects()
     
 def add_project():
+    # the description writer may be used below, load its model while the details are typed in
+    models.warm_up_async(models.REASONING_MODEL)
     while True:
         project_name = input("Enter the project name (Type back to return to adjusting projects menu): ")
         if project_name.lower() == "back":
@@ -43,24 +45,19 @@ def add_project():
         else:
             description = input("Enter a brief description of the project: ")
         
-        if project_name in pd.read_csv('Stored Info/projects_bank.csv')['project_name'].values:
+        if project_name in bs.get_bank('projects_bank.csv')['project_name'].values:
             print(f"Project '{project_name}' already exists. Please enter a different project name.")
             continue
         
-        projects_df = pd.read_csv('Stored Info/projects_bank.csv')
-        
-        new_row = pd.DataFrame(
-            {'project_name': [project_name], 
-             'description': [description], 
-             'start_month': [start_month],
-             'start_year': [start_year],
-             'end_month': [end_month],
-             'end_year': [end_year],
-             'link1': [link1], 
-             'link2': [link2]})
-        
-        projects_df = pd.concat([projects_df, new_row], ignore_index=True)
-        projects_df.to_csv('Stored Info/projects_bank.csv', index=False)
+        bs.append_row('projects_bank.csv',
+            {'project_name': project_name, 
+             'description': description, 
+             'start_month': start_month,
+             'start_year': start_year,
+             'end_month': end_month,
+             'end_year': end_year,
+             'link1': link1, 
+             'link2': link2})
         print(f"Project '{project_name}' added successfully.\n")
 
 def project_description_writer():
@@ -99,44 +96,20 @@ def project_description_writer():
     
     
     t1 = time.time()
-    generative_model = ChatOllama(model="deepseek-r1", streaming=True, reasoning=True)
+    generative_model = models.get_model(models.REASONING_MODEL, streaming=True, reasoning=True)
     print(f"Model init took: {time.time() - t1:.2f}s")
     
     t2 = time.time()
-    prompt = ChatPromptTemplate.from_template(generate_description_prompt)
-    chain = prompt | generative_model
+    chain = models.get_chain(generate_description_prompt, models.REASONING_MODEL, streaming=True, reasoning=True)
     print(f"Chain creation took: {time.time() - t2:.2f}s")
     
     user_desc = input("Please write a bit about the project you did, focusing on your responsibilities, difficulties you overcame, and achievements. The AI will take this answer and help streamline it.\n>>> ")
     
     inputs = {"user_description": user_desc}
     
-    print("Waiting for first token...")
-    t3 = time.time()
-    
-    print("Initializing Response (May take a bit to get started)...\n")
-    first_token_received = False
-    
-    summary_text = ""
+    summary_text = streaming.stream_with_cache(chain, models.REASONING_MODEL, generate_description_prompt, inputs, showReasoning, label="project description")
     
-    for chunk in chain.stream(inputs):
-        if not first_token_received:
-            print(f"First token received after: {time.time() - t3:.2f}s")
-            first_token_received = True
-        # Check for reasoning (thinking) tokens
-        # These are usually in additional_kwargs when reasoning=True
-        reasoning = chunk.additional_kwargs.get("reasoning_content", "")
-        if reasoning and showReasoning:
-            print(f"\033[90m{reasoning}\033[0m", end="", flush=True)
-        
-        # Check for the actual answer tokens
-        content = chunk.content
-        if content:
-            print(content, end="", flush=True)
-            summary_text += content
-    
-    followup_prompt = ChatPromptTemplate.from_template(refine_description_prompt)
-    followup_chain = followup_prompt | generative_model
+    followup_chain = models.get_chain(refine_description_prompt, models.REASONING_MODEL, streaming=True, reasoning=True)
     
     while True: # fix formatting here, we want it to match previous messages
         user_input = input("\nAsk a followup question (or type 'exit' to quit) >>> ").strip()
@@ -151,25 +124,13 @@ def project_description_writer():
             "description_short": user_desc
         }
         
-        summary_text = ""
-        
-        for chunk in followup_chain.stream(followup_inputs):
-            # Check for reasoning (thinking) tokens
-            reasoning = chunk.additional_kwargs.get("reasoning_content", "")
-            if reasoning and showReasoning:
-                print(f"\033[90m{reasoning}\033[0m", end="", flush=True)
-            
-            # Check for the actual answer tokens
-            content = chunk.content
-            if content:
-                print(content, end="", flush=True)
-                summary_text += content
+        summary_text = streaming.consume(followup_chain.stream(followup_inputs), show_reasoning=showReasoning, label="project description refinement", model=models.REASONING_MODEL).text
     
     return summary_text.strip()
 
 def remove_project():
     while True:
-        projects_df = pd.read_csv('Stored Info/projects_bank.csv')
+        projects_df = bs.get_bank('projects_bank.csv')
         
         project_to_remove = input("Enter the project name to remove (Type back to return to adjusting projects menu): ")
         
@@ -178,15 +139,15 @@ def remove_project():
             return
         
         if project_to_remove in projects_df['project_name'].values:
-            projects_df = projects_df[projects_df['project_name'] != project_to_remove]
-            projects_df.to_csv('Stored Info/projects_bank.csv', index=False)
+            bs.remove_rows('projects_bank.csv', projects_df['project_name'] == project_to_remove)
             print(f"Project '{project_to_remove}' removed successfully.")
         else:
             print(f"Project '{project_to_remove}' not found.")
 
 def edit_project():
+    models.warm_up_async(models.REASONING_MODEL)
     while True:
-        projects_df = pd.read_csv('Stored Info/projects_bank.csv')
+        projects_df = bs.get_bank('projects_bank.csv')
         
         project_to_edit = input("Enter the project name to edit (Type back to return to adjusting projects menu): ")
         
@@ -208,7 +169,7 @@ def edit_project():
             link2 = input("Enter the new second link related to the project (or leave blank): ")
             
             projects_df.loc[projects_df['project_name'] == project_to_edit, ['description', 'start_month', 'start_year', 'end_month', 'end_year', 'link1', 'link2']] = [description, start_month, start_year, end_month, end_year, link1, link2]
-            projects_df.to_csv('Stored Info/projects_bank.csv', index=False)
+            bs.mark_dirty('projects_bank.csv')
             print(f"Project '{project_to_edit}' updated successfully.")
         else:
             print(f"Project '{project_to_edit}' not found.")
\ No newline at end of file
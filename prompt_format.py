@@ -0,0 +1,59 @@
+import math
+import re
+
+# Compact serialization of bank rows for LLM prompts.
+# DataFrame.to_dict(orient='index') repeats every column name on every row and spells out every empty cell as nan.
+# Here each section becomes a small table instead: the column names once, then one delimited line per item that
+# starts with the item's bank index. Columns that are empty for every row are left out, empty cells stay blank and
+# long text is cut to MAX_FIELD_CHARS.
+
+DELIMITER = " | "
+MAX_FIELD_CHARS = 300
+
+_WHITESPACE = re.compile(r"\s+")
+_TOKEN_PIECE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+def format_value(value, max_chars=MAX_FIELD_CHARS):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value) # years and months come back from the csv as 2023.0
+    text = _WHITESPACE.sub(" ", str(value)).strip().replace("|", "/")
+    if len(text) > max_chars:
+        text = text[:max_chars - 1].rstrip() + "…"
+    return text
+
+def serialize_rows(rows, columns=None, max_chars=MAX_FIELD_CHARS):
+    """
+    rows: {index: row dict}. Returns a header line naming the columns, then one line per row beginning with its
+    index, e.g.
+        index | skill_name | level
+        0 | Python | 8
+    """
+    if not rows:
+        return "(none)"
+    if columns is None:
+        columns = list(next(iter(rows.values())).keys())
+
+    cells = {index: [format_value(row.get(column), max_chars) for column in columns] for index, row in rows.items()}
+    kept = [position for position in range(len(columns)) if any(values[position] for values in cells.values())]
+
+    lines = [DELIMITER.join(["index"] + [columns[position] for position in kept])]
+    for index, values in cells.items():
+        lines.append(DELIMITER.join([str(index)] + [values[position] for position in kept]))
+    return "\n".join(lines)
+
+def count_tokens(text):
+    """
+    Approximate the number of tokens a BPE tokenizer would produce: every punctuation mark is one token, words
+    and numbers cost one token per ~4 characters. Close enough to budget prompts without loading a tokenizer.
+    """
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PIECE.findall(str(text)))
+
+def report_prompt_size(sections, label="Prompt size"):
+    """Print the approximate token count of each named prompt section ({name: text}) and their total"""
+    counts = {name: count_tokens(text) for name, text in sections.items()}
+    print(f"{label}: ~{sum(counts.values())} tokens")
+    for name, count in counts.items():
+        print(f"  {name.replace('_', ' ')}: ~{count}")
+    return counts
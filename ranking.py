@@ -0,0 +1,90 @@
+import math
+from collections import Counter
+from functools import lru_cache
+import retrieval
+import resume_optimizer
+
+# BM25 ranking of bank items against a job description.
+# Each section's item texts become a sparse document-term matrix (kept as coordinate arrays: row, term, weight) with
+# the BM25 term weights precomputed, so scoring a job is one gather and one bincount over the non-zero entries and
+# takes milliseconds for hundreds of items. The matrices are cached on the item texts, so analyzing many jobs
+# against the same banks builds them once.
+# Used as the relevance score in retrieval.py (the pre-ranker in front of the model) and, together with
+# resume_optimizer.py, on its own as the fast resume selection, which needs no model at all.
+
+K1 = 1.5 # how quickly repeated terms stop adding to an item's score
+B = 0.75 # how much longer items are penalized
+
+class BM25Index:
+    def __init__(self, documents):
+        """documents: list of token lists, one per item"""
+        import numpy as np
+
+        self.vocabulary = {}
+        rows, terms = [], []
+        for row, tokens in enumerate(documents):
+            for token in tokens:
+                terms.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                rows.append(row)
+        self.n_docs = len(documents)
+        n_terms = max(len(self.vocabulary), 1)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        terms = np.asarray(terms, dtype=np.int64)
+        # collapse repeated (item, term) pairs into term frequencies
+        pairs, term_frequency = np.unique(rows * n_terms + terms, return_counts=True)
+        self.rows = pairs // n_terms
+        self.terms = pairs % n_terms
+
+        doc_length = np.bincount(rows, minlength=self.n_docs)
+        doc_frequency = np.bincount(self.terms, minlength=n_terms)
+        idf = np.log(1 + (self.n_docs - doc_frequency + 0.5) / (doc_frequency + 0.5))
+        average_length = doc_length.mean() if self.n_docs and doc_length.any() else 1.0
+        norm = K1 * (1 - B + B * doc_length[self.rows] / average_length)
+        self.weights = idf[self.terms] * term_frequency * (K1 + 1) / (term_frequency + norm)
+
+    def score(self, query_tokens):
+        """Return the BM25 score of every item for the query, as an array in item order"""
+        import numpy as np
+
+        query = np.zeros(max(len(self.vocabulary), 1))
+        for token, count in Counter(query_tokens).items():
+            term = self.vocabulary.get(token)
+            if term is not None:
+                query[term] = 1 + math.log(count) # a term the job repeats matters more, but not linearly
+        return np.bincount(self.rows, weights=self.weights * query[self.terms], minlength=self.n_docs)
+
+@lru_cache(maxsize=32)
+def _index(texts):
+    return BM25Index([retrieval.tokenize(text) for text in texts])
+
+def score_items(job_description, rows):
+    """Return {index: score} for a section's item texts ({index: text}) against the job description"""
+    if not rows:
+        return {}
+    scores = _index(tuple(rows.values())).score(retrieval.tokenize(job_description))
+    return {index: float(score) for index, score in zip(rows, scores)}
+
+def rank_sections(job_description, sections):
+    """
+    sections: the bank rows by section, as from resume_selection.load_bank_items.
+    Returns {section name: [(index, score), ...]} best first.
+    """
+    ranked = {}
+    for section, rows in sections.items():
+        scores = score_items(job_description, {index: retrieval.item_text(section, row) for index, row in rows.items()})
+        ranked[section] = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return ranked
+
+def page_scores(job_description, sections):
+    """Every item's relevance, scaled to be comparable across sections (see resume_optimizer.weight_scores)"""
+    ranked = rank_sections(job_description, sections)
+    return resume_optimizer.weight_scores({section: dict(items) for section, items in ranked.items()})
+
+def fast_selection(job_description, sections, page_height=resume_optimizer.PAGE_HEIGHT):
+    """
+    Pick the resume items without a model: the most relevant set of items (those sharing at least one term with the
+    job) that fits on one page, see resume_optimizer.optimize. Returns its result, where "selection" has the same
+    shape as a parsed model selection and "forms" says which work experiences use the long form.
+    """
+    return resume_optimizer.optimize(sections, page_scores(job_description, sections), page_height)
@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import resume_optimizer as ropt
+
+# Genetic search over resume selections.
+# A genome holds one gene per candidate item: 0 leaves it out, 1.. picks one of its forms from
+# resume_optimizer.candidate_options (for work experience: long or short). Fitness is the total value of the picks,
+# minus a penalty for every point the estimated layout runs past one page. Where the knapsack optimizer returns the
+# single best page, the search keeps a whole population of good, different pages, which is what the user picks and
+# mutates from.
+# For large searches fitness is evaluated in a process pool, a slice of the population per core (a resume sized
+# search stays in this process, see POOL_MIN_GENES). All random choices are made in the parent process from one
+# seeded generator, so a seed gives the same result for any number of workers.
+
+POPULATION_SIZE = 200
+GENERATIONS = 150
+ELITE = 4 # best genomes copied unchanged into the next generation
+TOURNAMENT_SIZE = 3
+OVERFLOW_PENALTY = 2.0 # times the best value per point any item offers, per point past the page
+# genes (population x items) per generation below which fitness is evaluated in this process: for a real profile
+# (~100 items, population 200) sending the population to other processes costs more than evaluating it
+POOL_MIN_GENES = 1_000_000
+
+class Problem:
+    def __init__(self, sections, scores, page_height=ropt.PAGE_HEIGHT, education_count=1):
+        """sections and scores as for resume_optimizer.optimize"""
+        import numpy as np
+
+        self.items = [] # (section, index, [(form, height, value), ...])
+        for section in ropt.SECTIONS:
+            for index, row in sections.get(section, {}).items():
+                score = scores.get(section, {}).get(index, 0)
+                options = [(form, height, score * share) for form, height, share in ropt.candidate_options(section, row)]
+                if score > 0 and options:
+                    self.items.append((section, index, options))
+
+        width = 1 + max((len(options) for _, _, options in self.items), default=0)
+        # column 0 of both tables is "left out"
+        self.values = np.zeros((len(self.items), width))
+        self.heights = np.zeros((len(self.items), width))
+        self.option_counts = np.zeros(len(self.items), dtype=np.int64)
+        self.section_matrix = np.zeros((len(self.items), len(ropt.SECTIONS)))
+        for position, (section, _, options) in enumerate(self.items):
+            self.option_counts[position] = len(options)
+            self.section_matrix[position, ropt.SECTIONS.index(section)] = 1
+            for number, (_, height, value) in enumerate(options, start=1):
+                self.values[position, number] = value
+                self.heights[position, number] = height
+
+        self.fixed_height = ropt.fixed_height(education_count)
+        self.capacity = page_height - self.fixed_height
+        densities = (self.values[:, 1:] / np.maximum(self.heights[:, 1:], 1)).max(axis=1) if self.items else np.zeros(0)
+        self.penalty = OVERFLOW_PENALTY * (densities.max() if densities.size else 1.0)
+        # chance of an item being switched on when a genome is made or a gene mutates: items worth more per point
+        # of page are tried more often, the average item about often enough to fill one page
+        page_items = self.capacity / max(self.heights[:, 1].mean(), 1) if self.items else 0
+        self.include_probability = np.minimum(1.0, page_items * densities / max(densities.sum(), 1e-12))
+
+    def tables(self):
+        return self.values, self.heights, self.section_matrix, self.capacity, self.penalty
+
+def evaluate(tables, population):
+    """Return (fitness, value, height) arrays for a population matrix (genomes x items)"""
+    import numpy as np
+
+    values, heights, section_matrix, capacity, penalty = tables
+    rows = np.arange(population.shape[1])
+    value = values[rows, population].sum(axis=1)
+    sections_used = ((population > 0) @ section_matrix) > 0
+    height = heights[rows, population].sum(axis=1) + sections_used.sum(axis=1) * ropt.SECTION_HEIGHT
+    fitness = value - penalty * np.maximum(height - capacity, 0)
+    return fitness, value, height
+
+_worker_tables = None
+
+def _init_worker(tables):
+    global _worker_tables
+    _worker_tables = tables
+
+def _evaluate_slice(population):
+    return evaluate(_worker_tables, population)[0]
+
+def _random_genes(problem, rng, positions):
+    """Random genes for the given item positions: an item is on with its include_probability, in a random form"""
+    import numpy as np
+
+    counts = problem.option_counts[positions]
+    genes = rng.integers(1, counts + 1).astype(np.int8)
+    genes[rng.random(len(positions)) >= problem.include_probability[positions]] = 0
+    return genes
+
+def _random_population(problem, rng, size):
+    import numpy as np
+
+    positions = np.tile(np.arange(len(problem.items)), size)
+    return _random_genes(problem, rng, positions).reshape(size, len(problem.items))
+
+def decode(problem, genome):
+    """Return a genome as a resume_optimizer style result"""
+    selection = {section: [] for section in ropt.SECTIONS}
+    forms = {}
+    for (section, index, options), gene in zip(problem.items, genome):
+        if gene:
+            selection[section].append(index)
+            if section == "work_experience":
+                forms[index] = options[gene - 1][0]
+    fitness, value, height = evaluate(problem.tables(), genome.reshape(1, -1))
+    return {"selection": selection, "forms": forms, "height": float(height[0]) + problem.fixed_height, "value": float(value[0]), "fitness": float(fitness[0])}
+
+def encode(problem, selection, forms=None):
+    """Turn a selection ({section: [index, ...]}, e.g. from the optimizer or the model) into a genome"""
+    import numpy as np
+
+    forms = forms or {}
+    genome = np.zeros(len(problem.items), dtype=np.int8)
+    for position, (section, index, options) in enumerate(problem.items):
+        if index in selection.get(section, []):
+            names = [form for form, _, _ in options]
+            genome[position] = names.index(forms[index]) + 1 if forms.get(index) in names else 1
+    return genome
+
+def evolve(problem, generations=GENERATIONS, population_size=POPULATION_SIZE, seed=0, workers=None, seed_genomes=None, mutation_rate=None):
+    """
+    Run the search and return the final population (best first) with its fitness.
+    workers: processes evaluating fitness, 1 to stay in this process, None for one per core once a generation has
+    POOL_MIN_GENES genes (this process below that).
+    seed_genomes: genomes to start from (e.g. the optimizer's page or one the user picked), the rest is random.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    n_items = len(problem.items)
+    population = _random_population(problem, rng, population_size)
+    for position, genome in enumerate(seed_genomes or []):
+        population[position % population_size] = genome
+    mutation_rate = mutation_rate or 2.0 / max(n_items, 1)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if population_size * n_items >= POOL_MIN_GENES else 1
+    tables = problem.tables()
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tables,)) if workers > 1 else None
+    def fitness_of(population):
+        if executor is None:
+            return evaluate(tables, population)[0]
+        return np.concatenate(list(executor.map(_evaluate_slice, np.array_split(population, workers))))
+
+    try:
+        fitness = fitness_of(population)
+        for _ in range(generations):
+            order = np.argsort(-fitness, kind="stable")
+            elite = population[order[:ELITE]]
+
+            # tournament selection: the fittest of TOURNAMENT_SIZE random genomes becomes a parent
+            contenders = rng.integers(0, population_size, size=(2, population_size - ELITE, TOURNAMENT_SIZE))
+            parents = np.take_along_axis(contenders, fitness[contenders].argmax(axis=2)[..., None], axis=2)[..., 0]
+            # uniform crossover, then redraw a few genes
+            children = np.where(rng.random((population_size - ELITE, n_items)) < 0.5, population[parents[0]], population[parents[1]])
+            mutate = np.nonzero(rng.random(children.shape) < mutation_rate)
+            children[mutate] = _random_genes(problem, rng, mutate[1])
+
+            population = np.concatenate([elite, children])
+            fitness = fitness_of(population)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    order = np.argsort(-fitness, kind="stable")
+    return population[order], fitness[order]
+
+def distinct_variants(problem, population, count=3, min_difference=2):
+    """
+    The first `count` genomes of a population (best first) that differ from each other in at least min_difference
+    items, as (genome, decoded result) pairs
+    """
+    import numpy as np
+
+    picked = []
+    for genome in population:
+        if all(np.count_nonzero((genome > 0) != (other > 0)) >= min_difference for other in picked):
+            picked.append(genome)
+        if len(picked) == count:
+            break
+    return [(genome, decode(problem, genome)) for genome in picked]
@@ -0,0 +1,204 @@
+import math
+
+# One page resume selection as a knapsack problem.
+# Every candidate entry gets a value (its relevance score) and an estimated height in points, from the layout that
+# resume_creation_latex.create_resume_latex produces (A4, 12pt, 0.9in margins). Each section is solved on its own
+# as a 0/1 knapsack over 1pt heights (a work experience is a group: long form, short form or left out), a section's
+# heading is only paid for when something is picked from it, and the sections are combined with a max-plus
+# convolution of their best-value-per-height curves. Hundreds of candidates take a few milliseconds.
+
+PAGE_HEIGHT = 714 # points of text height on A4 (845pt) inside 0.9in (65pt) margins
+
+# 12pt article: \normalsize lines are 14.5pt apart, \small (projects) 13.6pt. Characters per line are for the
+# 467pt text width, less where an itemize indents the text
+LINE_HEIGHT = 14.5
+SMALL_LINE_HEIGHT = 13.6
+CHARS_PER_LINE = 80
+SMALL_CHARS_PER_LINE = 88
+ITEM_CHARS_PER_LINE = 74
+BULLET_CHARS_PER_LINE = 76
+
+PARAGRAPH_SKIP = 7 # parskip between entries
+SECTION_HEIGHT = 44 # \Large title, rule and 10pt spacing on both sides
+HEADER_HEIGHT = 62 # name in \Huge and the contact line
+EDUCATION_HEIGHT = 3 * LINE_HEIGHT + PARAGRAPH_SKIP # per degree: institution, degree and GPA lines
+FOOTER_HEIGHT = 20
+
+SHORT_FORM_VALUE = 0.6 # a one paragraph work experience shows less than three bullets, worth this share of the score
+
+# what the most relevant item of each section is worth, a skill line adds far less to a resume than a job does
+SECTION_WEIGHTS = {"work_experience": 10.0, "projects": 6.0, "coursework": 3.0, "skills": 1.0}
+
+SECTIONS = ["work_experience", "projects", "skills", "coursework"]
+
+def _text(value):
+    return value.strip() if isinstance(value, str) else ""
+
+def text_lines(text, chars_per_line):
+    return max(1, math.ceil(len(_text(text)) / chars_per_line))
+
+def job_long_height(row):
+    bullets = [_text(row.get(f"bullet{number}_long")) for number in (1, 2, 3)]
+    bullets = [bullet for bullet in bullets if bullet]
+    lines = sum(text_lines(bullet, BULLET_CHARS_PER_LINE) for bullet in bullets)
+    # title row with 3.75pt below it, the bullets 3pt apart, the strut after the list
+    return LINE_HEIGHT + 3.75 + lines * LINE_HEIGHT + 3 * max(len(bullets) - 1, 0) + 0.3 * LINE_HEIGHT + PARAGRAPH_SKIP
+
+def job_short_height(row):
+    return LINE_HEIGHT + 3.75 + text_lines(row.get("description_short"), CHARS_PER_LINE) * LINE_HEIGHT + PARAGRAPH_SKIP
+
+def project_height(row):
+    return SMALL_LINE_HEIGHT + 3.75 + text_lines(row.get("description"), SMALL_CHARS_PER_LINE) * SMALL_LINE_HEIGHT + PARAGRAPH_SKIP
+
+def course_height(row):
+    # rendered as "Name (Institution, year semester, Recieved a grade): description"
+    text = f"{row.get('course_name')} ({row.get('institution')}, {row.get('year')} {row.get('semester')}, Recieved a {row.get('grade')}): {_text(row.get('description'))}"
+    return text_lines(text, ITEM_CHARS_PER_LINE) * LINE_HEIGHT + 1
+
+def skill_height(row):
+    # skills share "Skills: a, b, c" lines, so each one costs the part of a line its name takes up
+    return (len(_text(row.get("skill_name"))) + 2) / ITEM_CHARS_PER_LINE * LINE_HEIGHT
+
+def candidate_options(section, row):
+    """Return [(form, height in points, share of the score)] for the ways an item can appear on the page"""
+    if section == "work_experience":
+        options = []
+        if any(_text(row.get(f"bullet{number}_long")) for number in (1, 2, 3)):
+            options.append(("long", job_long_height(row), 1.0))
+        if _text(row.get("description_short")):
+            options.append(("short", job_short_height(row), SHORT_FORM_VALUE))
+        return options
+    if section == "projects":
+        return [("entry", project_height(row), 1.0)]
+    if section == "coursework":
+        return [("entry", course_height(row), 1.0)]
+    if section == "skills":
+        return [("entry", skill_height(row), 1.0)]
+    return []
+
+def weight_scores(scores, weights=None):
+    """
+    Make raw relevance scores ({section: {index: score}}) comparable across sections: each section is scaled so its
+    best item is worth the section's weight
+    """
+    weights = {**SECTION_WEIGHTS, **(weights or {})}
+    weighted = {}
+    for section, section_scores in scores.items():
+        best = max(section_scores.values(), default=0) or 1
+        weighted[section] = {index: weights.get(section, 1.0) * score / best for index, score in section_scores.items()}
+    return weighted
+
+def fixed_height(education_count=1):
+    return HEADER_HEIGHT + SECTION_HEIGHT + education_count * EDUCATION_HEIGHT + FOOTER_HEIGHT
+
+def _solve_section(candidates, capacity):
+    """
+    candidates: [(index, [(form, height, value), ...])], heights in whole points.
+    Returns best[h] (the most value that fits in h points) and the per-item choice table to rebuild the picks.
+    """
+    import numpy as np
+
+    best = np.zeros(capacity + 1)
+    choices = []
+    for _, options in candidates:
+        updated = best.copy()
+        choice = np.zeros(capacity + 1, dtype=np.int8)
+        for number, (_, height, value) in enumerate(options, start=1):
+            if height > capacity or value <= 0:
+                continue
+            candidate = np.full(capacity + 1, -np.inf)
+            candidate[height:] = best[:capacity + 1 - height] + value
+            better = candidate > updated
+            updated[better] = candidate[better]
+            choice[better] = number
+        best = updated
+        choices.append(choice)
+    return best, choices
+
+def _rebuild_section(candidates, choices, budget):
+    """Walk the choice table back from budget. Returns {index: form} in bank order and the height they take"""
+    picked = {}
+    used = 0
+    for (index, options), choice in zip(reversed(candidates), reversed(choices)):
+        number = choice[budget]
+        if number:
+            form, height, _ = options[number - 1]
+            picked[index] = form
+            budget -= height
+            used += height
+    return dict(reversed(list(picked.items()))), used
+
+def _max_plus(left, right):
+    """combined[h] = max over a of left[a] + right[h - a], and the a that achieves it"""
+    import numpy as np
+
+    size = len(left)
+    combined = np.full(size, -np.inf)
+    split = np.zeros(size, dtype=np.int64)
+    for a in range(size):
+        candidate = left[a] + right[:size - a]
+        better = candidate > combined[a:]
+        combined[a:][better] = candidate[better]
+        split[a:][better] = a
+    return combined, split
+
+def optimize(sections, scores, page_height=PAGE_HEIGHT, education_count=1):
+    """
+    sections: the bank rows by section (see resume_selection.load_bank_items).
+    scores: {section name: {index: value}} (see weight_scores), items without a positive value are left out.
+    Returns {"selection": {section: [index, ...]}, "forms": {work experience index: "long" or "short"},
+    "height": estimated points used, "value": total score of the picks}.
+    """
+    import numpy as np
+
+    capacity = max(int(page_height - fixed_height(education_count)), 0)
+    section_curves, section_tables, section_candidates = [], [], []
+    for section in SECTIONS:
+        candidates = []
+        for index, row in sections.get(section, {}).items():
+            score = scores.get(section, {}).get(index, 0)
+            if score <= 0:
+                continue
+            options = [(form, math.ceil(height), score * share) for form, height, share in candidate_options(section, row)]
+            if options:
+                candidates.append((index, options))
+        best, choices = _solve_section(candidates, capacity)
+
+        # the heading comes with the first item: curve[h] = best[h - heading] once there is room for it
+        curve = np.zeros(capacity + 1)
+        if capacity >= SECTION_HEIGHT:
+            curve[SECTION_HEIGHT:] = np.maximum(best[:capacity + 1 - SECTION_HEIGHT], 0)
+        section_curves.append(curve)
+        section_tables.append(choices)
+        section_candidates.append(candidates)
+
+    # fold the sections together, keeping each split to walk back through
+    total = section_curves[0]
+    splits = []
+    for curve in section_curves[1:]:
+        total, split = _max_plus(total, curve)
+        splits.append(split)
+
+    budgets = [0] * len(SECTIONS)
+    budget = capacity
+    for position in range(len(SECTIONS) - 1, 0, -1):
+        left_budget = int(splits[position - 1][budget])
+        budgets[position] = budget - left_budget
+        budget = left_budget
+    budgets[0] = budget
+
+    selection, forms, used = {}, {}, 0
+    for section, candidates, choices, budget in zip(SECTIONS, section_candidates, section_tables, budgets):
+        picked, height = _rebuild_section(candidates, choices, budget - SECTION_HEIGHT) if budget >= SECTION_HEIGHT else ({}, 0)
+        selection[section] = list(picked)
+        if picked:
+            used += SECTION_HEIGHT + height
+        if section == "work_experience":
+            forms = picked
+
+    return {
+        "selection": selection,
+        "forms": forms,
+        "height": used + fixed_height(education_count),
+        "value": float(total[capacity]),
+    }
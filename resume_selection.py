@@ -0,0 +1,152 @@
+import bank_store as bs
+import models
+import llm_cache
+import streaming
+import retrieval
+import selection_parser as sparse
+import prompt_format as pformat
+
+# The resume selection step shared by the interactive resume creator (analyzer.create_resume_ai) and batch analysis
+# (batch_resume.py): which skills, projects, coursework and work experience are relevant to a job.
+
+# The conversation is laid out so every turn starts with exactly the same messages: the system message holds the job
+# and the datasets, the request comes after it, and each follow-up only appends the previous answer and the new
+# feedback. Ollama keeps the evaluated prompt of the last request, so a follow-up only has to process what was added.
+
+SYSTEM_PROMPT = """
+
+    You are an expert career coach. A client has provided you with a job description for a position they are interested in applying for.
+    You have access to a large dataset of the client's skills, projects, coursework, and work experience.
+
+    Job Description: {job_description}
+
+    The client's datasets are as follows. Each one is a table: the first line names the columns, separated by |, and every other line is one item, starting with its index.
+
+    Coursework:
+    {coursework}
+
+    Projects:
+    {projects}
+
+    Skills:
+    {skills}
+
+    Work Experience:
+    {work_experience}
+
+    """
+
+SELECTION_REQUEST = """
+
+    Based off of the job description, please analyze the client's datasets and determine which skills, projects, coursework, and work experience are most relevant to the job.
+    Your goal is to help the client create a tailored resume that highlights their most relevant qualifications for the job.
+
+    The client would like you to select the most relevant items from each dataset to include in their resume. The resume is meant to be no longer than a single page, so please be selective in your choices.
+
+    Make sure to include in your answer a python valid dictionary, where the keys are the sections of the resume, and the values are a list of the indices of the items from the datasets that you think should correspond to the dataset.
+    This dictionary is essential to be included in the proper format, as the program will not function otherwise.
+    For example, if you think that you want to include skills 1, 3, and 5 from the skills dataset, and projects 2 and 4 from the projects dataset, your response should look like this:
+
+    {{"skills": [1, 3, 5], "projects": [2, 4], "coursework": [...], "work_experience": [...]}}
+
+    """
+
+GENERATE_RESUME_PROMPT = (("system", SYSTEM_PROMPT), ("human", SELECTION_REQUEST))
+
+# filled in with str.format for each follow-up, braces are doubled as in the templates
+REFINE_RESUME_PROMPT = """
+
+    The client has read your selection and has the following feedback or question: {user_feedback}
+
+    Please answer the client. If the feedback changes which items should be on the resume, revise your selection accordingly and include the complete updated python dictionary in the same format as before, e.g. {{"skills": [1, 3, 5], "projects": [2, 4], "coursework": [...], "work_experience": [...]}}
+
+    """
+
+SECTIONS = ["coursework", "projects", "skills", "work_experience"]
+
+def load_bank_items():
+    """
+    Return {section name: {index: row dict}} for every bank, each section being its bank's
+    DataFrame.to_dict(orient='index'). This is the sections argument of ranking, retrieval and resume_optimizer.
+    """
+    return {section: bs.get_bank(f"{section}_bank.csv").to_dict(orient='index') for section in SECTIONS}
+
+def build_inputs(job_description, all_items=None, verbose=True):
+    """
+    Return the prompt inputs for a job (the relevant rows of each bank serialized as tables, plus the description)
+    and {section: set of the indices shown}, the only ones a selection may use.
+    """
+    all_items = all_items if all_items is not None else load_bank_items()
+
+    # only the items that look relevant to this job go into the prompt, keyed by their original bank index
+    relevant_items, _ = retrieval.select_relevant(job_description, all_items)
+    if verbose:
+        for section in relevant_items:
+            print(f"Including {len(relevant_items[section])} of {len(all_items[section])} {section.replace('_', ' ')} items")
+
+    inputs = {section: pformat.serialize_rows(relevant_items[section]) for section in SECTIONS}
+    inputs["job_description"] = job_description
+    return inputs, {section: set(relevant_items[section]) for section in SECTIONS}
+
+def generate_selection(inputs, valid_indices=None):
+    """
+    Run the selection prompt without printing anything, stopping as soon as the answer holds a valid selection dict,
+    and reuse a cached answer when there is one. Returns the answer text and its SelectionParser.
+    """
+    parser = sparse.SelectionParser(valid_indices)
+    cached_response = llm_cache.get(models.REASONING_MODEL, GENERATE_RESUME_PROMPT, inputs)
+    if cached_response is not None:
+        parser.feed(cached_response)
+        return cached_response, parser
+
+    chain = models.get_chain(GENERATE_RESUME_PROMPT, models.REASONING_MODEL, streaming=True, reasoning=True)
+    summary_text = streaming.consume(chain.stream(inputs), show_content=False, label="resume selection (batch)", model=models.REASONING_MODEL, stop=parser.feed).text
+    llm_cache.put(models.REASONING_MODEL, GENERATE_RESUME_PROMPT, inputs, summary_text)
+    return summary_text, parser
+
+def item_label(section, row):
+    if section == "work_experience":
+        return f"{row.get('role')} at {row.get('company')}"
+    return str(row.get(retrieval.TEXT_FIELDS[section][0]))
+
+def item_key(section, row):
+    """A name for a bank row that still finds it after the bank is renumbered (indices shift when rows are removed)"""
+    if section == "coursework":
+        course_id = row.get("course_id")
+        if course_id is not None and course_id == course_id: # not NaN
+            return str(course_id)
+    return item_label(section, row)
+
+def describe_selection(selection, all_items):
+    """Return printable lines naming the items picked in each section"""
+    lines = []
+    for section in SECTIONS:
+        names = [item_label(section, all_items[section][index]) for index in selection.get(section, []) if index in all_items[section]]
+        lines.append(f"{section.replace('_', ' ').title()}: {', '.join(names) if names else '(none)'}")
+    return lines
+
+def report_selection(parser, all_items):
+    if parser.selection is None:
+        print("\nCould not find a valid selection dictionary in the answer.")
+        return
+    print("\nSelected items:")
+    for line in describe_selection(parser.selection, all_items):
+        print("  " + line)
+    if parser.rejected:
+        print(f"Ignored indices the model was not shown: {parser.rejected}")
+
+def first_messages(inputs):
+    """The messages of the first request, which every follow-up repeats unchanged before adding to them"""
+    return models.get_prompt(GENERATE_RESUME_PROMPT).format_messages(**inputs)
+
+def followup_messages(history, answer, user_feedback):
+    """Append the model's last answer and the client's feedback to the conversation"""
+    from langchain_core.messages import AIMessage, HumanMessage
+    return history + [AIMessage(content=answer), HumanMessage(content=REFINE_RESUME_PROMPT.format(user_feedback=user_feedback))]
+
+def report_prompt_reuse(result, messages):
+    conversation_tokens = sum(pformat.count_tokens(message.content) for message in messages)
+    if result.prompt_tokens is None:
+        print(f"\n(Conversation is ~{conversation_tokens} tokens, Ollama did not report how many were re-evaluated)")
+    else:
+        print(f"\n(Ollama evaluated {result.prompt_tokens} prompt tokens this turn, the conversation is ~{conversation_tokens} tokens)")
@@ -0,0 +1,83 @@
+import re
+import prompt_format
+import ranking
+import skill_aliases
+
+# Retrieval stage in front of the resume prompt.
+# Scores every bank item against the job description and keeps only the top k per section (and overall no more
+# than a token budget), so the prompt stops growing with the size of the profile. Items keep their original bank
+# index as the dict key, so the indices the model answers with still point at the right rows.
+
+DEFAULT_K = {"skills": 25, "coursework": 8, "projects": 8, "work_experience": 6}
+TOKEN_BUDGET = 3000 # tokens of bank data allowed into the prompt across all sections
+
+# the columns that describe each kind of item, everything else (dates, links, levels) says nothing about relevance
+TEXT_FIELDS = {
+    "skills": ["skill_name"],
+    "coursework": ["course_name", "description"],
+    "projects": ["project_name", "description"],
+    "work_experience": ["role", "company", "description_short", "bullet1_long", "bullet2_long", "bullet3_long"],
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it", "its", "of", "on",
+    "or", "our", "that", "the", "their", "this", "to", "was", "we", "will", "with", "you", "your", "who", "all", "can",
+}
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+def tokenize(text):
+    return [token for token in _TOKEN.findall(str(text).lower()) if token not in STOPWORDS]
+
+def item_text(section, row):
+    text = " ".join(str(row[field]) for field in TEXT_FIELDS.get(section, []) if isinstance(row.get(field), str))
+    if section == "skills" and text:
+        # a job may spell the skill differently ("JS" for "JavaScript"), every spelling counts as the skill
+        text = " ".join(skill_aliases.search_spellings(text))
+    return text
+
+def score_items(job_description, rows):
+    """Return {index: score} for a section's item texts ({index: text}) against the job description (BM25, see ranking.py)"""
+    return ranking.score_items(job_description, rows)
+
+def select_relevant(job_description, sections, k=None, token_budget=TOKEN_BUDGET):
+    """
+    sections: as for ranking.rank_sections.
+    Returns the same structure holding only the selected rows, plus {section name: {index: score}} for them.
+    """
+    k = {**DEFAULT_K, **(k or {})}
+
+    ranked = {}
+    for section, rows in sections.items():
+        scores = score_items(job_description, {index: item_text(section, row) for index, row in rows.items()})
+        order = sorted(rows, key=lambda index: scores[index], reverse=True)
+        matched = [index for index in order if scores[index] > 0]
+        # nothing in the section matches the wording of the job, let the model judge the first few instead
+        ranked[section] = (matched or order)[:k.get(section, len(order))]
+        ranked[section] = [(index, scores[index]) for index in ranked[section]]
+
+    # fill the budget best first across sections, each score relative to the best item of its own section
+    candidates = []
+    for section, items in ranked.items():
+        best = max((score for _, score in items), default=0) or 1
+        for position, (index, score) in enumerate(items):
+            candidates.append((score / best, -position, section, index, score))
+    candidates.sort(reverse=True)
+
+    selected = {section: {} for section in sections}
+    selected_scores = {section: {} for section in sections}
+    used = 0
+    for _, _, section, index, score in candidates:
+        # what the row costs once serialized for the prompt
+        cost = prompt_format.count_tokens(prompt_format.serialize_rows({index: sections[section][index]}).split("\n", 1)[1])
+        if used + cost > token_budget:
+            continue
+        used += cost
+        selected_scores[section][index] = score
+
+    # keep the original bank order inside each section
+    for section, rows in sections.items():
+        for index in rows:
+            if index in selected_scores[section]:
+                selected[section][index] = rows[index]
+    return selected, selected_scores
@@ -0,0 +1,101 @@
+import ast
+import json
+
+# Incremental parser for the resume selection answer.
+# The model is asked for a dict like {"skills": [1, 3], "projects": [2], ...} somewhere in its reply. The parser is fed
+# the answer as it streams, keeps a stack of the positions of the braces still open (the dict holds only section names
+# and numbers, so braces inside strings are not a concern) and checks every {...} block the moment it closes, so the
+# stream can be stopped there instead of waiting for the explanation that usually follows. A stray "{" in the prose
+# before the dict only stays on the stack, the blocks inside it are still checked as they close.
+
+SECTIONS = ("skills", "projects", "coursework", "work_experience")
+MAX_BLOCK_CHARS = 2000 # a selection is a few hundred characters, anything longer is prose
+
+class SelectionParser:
+    def __init__(self, valid_indices=None):
+        """valid_indices: {section: set of indices the model may pick}, None accepts any non-negative index"""
+        self.valid_indices = valid_indices
+        self.selection = None # {section: [int, ...]} once a valid dict has been seen
+        self.rejected = {} # {section: [indices]} that were picked but are not valid for the section
+        self._reset()
+
+    def feed(self, text):
+        """Consume the next piece of the answer. Returns True once a valid selection is complete"""
+        if self.selection is not None:
+            return True
+        for char in text:
+            if char == "{":
+                self._open.append(len(self._buffer))
+            elif not self._open:
+                continue # outside any block, nothing to keep
+            self._buffer.append(char)
+
+            if char == "}":
+                start = self._open.pop()
+                if len(self._buffer) - start <= MAX_BLOCK_CHARS and self._check("".join(self._buffer[start:])):
+                    return True
+                if not self._open:
+                    self._buffer = []
+            elif self._open and len(self._buffer) - self._open[0] > MAX_BLOCK_CHARS:
+                # the outermost brace is too far back to open a selection (prose, or a brace that never closes):
+                # stop tracking it and keep only the text from the next open brace on
+                while self._open and len(self._buffer) - self._open[0] > MAX_BLOCK_CHARS:
+                    self._open.pop(0)
+                cut = self._open[0] if self._open else len(self._buffer)
+                self._buffer = self._buffer[cut:]
+                self._open = [start - cut for start in self._open]
+        return False
+
+    def _reset(self):
+        self._open = [] # positions in _buffer of the braces not closed yet, outermost first
+        self._buffer = [] # the answer from the outermost open brace on
+
+    def _check(self, block):
+        data = _load(block)
+        if not isinstance(data, dict) or not any(section in data for section in SECTIONS):
+            return False
+
+        selection, rejected = {}, {}
+        for section in SECTIONS:
+            values = data.get(section, [])
+            if not isinstance(values, (list, tuple)):
+                return False
+            selection[section] = []
+            for value in values:
+                index = _to_index(value)
+                if index is None:
+                    return False # e.g. the [...] placeholder from the example in the prompt
+                valid = self.valid_indices.get(section, set()) if self.valid_indices is not None else None
+                if index < 0 or (valid is not None and index not in valid):
+                    rejected.setdefault(section, []).append(index)
+                elif index not in selection[section]:
+                    selection[section].append(index)
+
+        self.selection = selection
+        self.rejected = rejected
+        return True
+
+def _load(block):
+    for loader in (json.loads, ast.literal_eval): # models write both json and python dicts
+        try:
+            return loader(block)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            continue
+    return None
+
+def _to_index(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return None
+
+def parse_selection(text, valid_indices=None):
+    """Return the first valid selection dict in a complete answer, or None"""
+    parser = SelectionParser(valid_indices)
+    parser.feed(text)
+    return parser.selection
@@ -0,0 +1,159 @@
+import re
+
+# One name per skill, however it is spelled.
+# A skill name is reduced to a key by case folding and dropping everything but letters (of any script), digits, +
+# and # (so "Node.js", "NodeJS" and "node js" share a key, while "C", "C++" and "C#" stay apart), and ALIASES maps
+# the spellings that differ in more than punctuation ("JS", "ECMAScript") onto one canonical name. The index is a
+# plain dict from key to canonical name, so every lookup is a single hash.
+# Used for duplicate checks in the skills bank, by the skill extractor (every spelling is searched for, the
+# canonical name is reported) and wherever skills are matched against job text.
+
+# canonical name: other spellings. Spellings that only differ in punctuation share a key already, they are listed
+# because the extractor searches the text for each spelling literally
+ALIASES = {
+    "JavaScript": ["JS", "ECMAScript", "ES6"],
+    "TypeScript": ["TS"],
+    "Python": ["Python3", "Python 3"],
+    "C++": ["CPP"],
+    "C#": ["C Sharp", "CSharp"],
+    "Golang": ["Go lang"],
+    "Objective-C": ["ObjC"],
+    "React.js": ["React", "ReactJS"],
+    "Node.js": ["Node", "NodeJS"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Next.js": ["NextJS"],
+    "Express.js": ["Express", "ExpressJS"],
+    "Angular": ["Angular 2+"],
+    ".NET": ["dotnet", "dot net", ".NET Core"],
+    "Ruby on Rails": ["Rails", "RoR"],
+    "Apache Spark": ["Spark"],
+    "Unity3D": ["Unity", "Unity 3D"],
+    "scikit-learn": ["sklearn", "scikit"],
+    "TensorFlow": ["TF"],
+    "PyTorch": ["Torch"],
+    "Hugging Face": ["HuggingFace", "Transformers"],
+    "PostgreSQL": ["Postgres", "psql"],
+    "SQL Server": ["MSSQL", "MS SQL", "Microsoft SQL Server"],
+    "MongoDB": ["Mongo"],
+    "Oracle Database": ["Oracle", "Oracle DB"],
+    "Elasticsearch": ["Elastic Search"],
+    "Amazon Web Services": ["AWS"],
+    "Google Cloud": ["GCP", "Google Cloud Platform"],
+    "Azure": ["Microsoft Azure"],
+    "Kubernetes": ["K8s"],
+    "AWS Lambda": ["Lambda"],
+    "CI/CD": ["Continuous Integration", "Continuous Delivery", "Continuous Deployment"],
+    "Machine Learning": ["ML"],
+    "Artificial Intelligence": ["AI"],
+    "Natural Language Processing": ["NLP"],
+    "Large Language Models": ["LLM", "LLMs"],
+    "Generative AI": ["GenAI"],
+    "Object-Oriented Programming": ["OOP", "Object Oriented Design", "OOD"],
+    "Test-Driven Development": ["TDD"],
+    "UI/UX": ["UX/UI", "UX", "User Experience"],
+    "RESTful APIs": ["REST APIs", "REST API", "RESTful", "REST"],
+    "Assembly Language": ["Assembly", "ASM"],
+    "Lean Manufacturing": ["Lean"],
+    "Power BI": ["PowerBI"],
+    "Microsoft Excel": ["Excel", "MS Excel"],
+    "Microsoft Office": ["MS Office", "Office 365", "Microsoft 365"],
+    "Linux": ["GNU/Linux"],
+    "Shell Scripting": ["Shell", "Bash Scripting"],
+    "Data Structures": ["Data Structures and Algorithms", "DSA"],
+    "Search Engine Optimization": ["SEO"],
+}
+
+# spellings that are ordinary English words more often than skills: they still normalize to the skill, but the
+# extractor and job_fit do not look for them in job descriptions (unless the skills bank uses exactly that spelling)
+# ("TF" is as often Terraform as TensorFlow)
+AMBIGUOUS = {
+    "React", "Node", "Express", "Excel", "Shell", "Torch", "Transformers", "Rails", "Scikit", "TF", "Spark", "Unity",
+    "Oracle", "Lambda", "REST", "Assembly", "ASM", "Lean",
+}
+
+_DROPPED = re.compile(r"[^\w+#]")
+
+def key(name):
+    """The lookup key of a skill name: case folded, with only letters (in any script), digits, + and # kept"""
+    return _DROPPED.sub("", str(name).casefold())
+
+class AliasIndex:
+    def __init__(self, aliases=ALIASES):
+        self._canonical = {} # key -> canonical name
+        self._spellings = {} # key of a canonical name -> every spelling of it
+        for name, others in aliases.items():
+            self.add(name, others)
+
+    def add(self, name, others=()):
+        """Register a canonical name and its other spellings. Existing entries win"""
+        name = str(name).strip()
+        canonical = self._canonical.setdefault(key(name), name)
+        spellings = self._spellings.setdefault(key(canonical), [canonical])
+        for spelling in [name, *others]:
+            self._canonical.setdefault(key(spelling), canonical)
+            if spelling not in spellings:
+                spellings.append(spelling)
+        return canonical
+
+    def canonical(self, name):
+        """The canonical spelling of a skill name, or the name itself when it has no entry"""
+        name = str(name).strip()
+        return self._canonical.get(key(name), name)
+
+    def canonical_key(self, name):
+        return key(self.canonical(name))
+
+    def spellings(self, name):
+        """Every known spelling of a skill, the canonical one first"""
+        canonical = self.canonical(name)
+        return list(self._spellings.get(key(canonical), [canonical]))
+
+INDEX = AliasIndex()
+
+def canonical(name):
+    return INDEX.canonical(name)
+
+def canonical_key(name):
+    return INDEX.canonical_key(name)
+
+def spellings(name):
+    return INDEX.spellings(name)
+
+def search_spellings(name):
+    """The spellings to look for in job text: the name itself and every unambiguous spelling of the skill"""
+    name = str(name).strip()
+    return list(dict.fromkeys([name] + [spelling for spelling in spellings(name) if spelling not in AMBIGUOUS]))
+
+class NameIndex:
+    """
+    The names in a list of skills (e.g. the skills bank) by canonical key, so whether a skill is already in the list,
+    and under which spellings, is a single lookup rather than a pass over the list
+    """
+    def __init__(self, names=()):
+        self._names = {} # canonical key -> [names as spelled in the list]
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        if isinstance(name, str):
+            self._names.setdefault(canonical_key(name), []).append(name)
+
+    def remove(self, name):
+        """Forget every name that is the same skill as name"""
+        name_key = canonical_key(name)
+        # a name of only punctuation has no key, it is not the same skill as every other such name
+        return self._names.pop(name_key, []) if name_key else []
+
+    def discard(self, name):
+        """Forget name itself, as spelled, but not its other spellings"""
+        name_key = canonical_key(name)
+        names = self._names.get(name_key, [])
+        if name in names:
+            names.remove(name)
+            if not names:
+                del self._names[name_key]
+
+    def get(self, name):
+        """The names in the list that are the same skill as name, as spelled there"""
+        name_key = canonical_key(name)
+        return list(self._names.get(name_key, [])) if name_key else []
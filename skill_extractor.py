@@ -0,0 +1,187 @@
+import time
+import bank_store as bs
+import skill_aliases as sa
+
+# Finds skill names in job descriptions, to fill the skills column of scraped jobs (job boards rarely do).
+# Every skill name, from skills_bank.csv and the built-in VOCABULARY below, is compiled into one Aho-Corasick
+# automaton, so a description is scanned once, a character at a time, however many skills are looked for.
+# The goto and failure links are resolved ahead of time into one transition dict per state, which makes the scan a
+# single dict lookup per character. Matching ignores case, and a match only counts as a whole word: "Java" is not
+# found inside "JavaScript", nor "C" inside "C++", nor "JS" inside "Node.js".
+# Each skill is searched for under all its spellings from skill_aliases, and reported under a single name.
+
+# common skills across software, data and general office roles. Words that are more often plain English than a skill
+# (Go, R, C, Excel, Swift, React, Spark, Lean, Rest...) are only looked for in a longer spelling, or when they are in
+# the skills bank; soft skills that read the same as ordinary prose (Leadership, Mentoring) are left out
+VOCABULARY = [
+    # languages
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Golang", "Rust", "Kotlin", "Scala", "Ruby", "PHP",
+    "Perl", "MATLAB", "Haskell", "Elixir", "Clojure", "Objective-C", "Dart", "Lua", "Fortran", "COBOL",
+    "Assembly Language", "Verilog", "VHDL", "Bash", "PowerShell", "Shell Scripting", "SQL", "T-SQL", "PL/SQL", "NoSQL",
+    "HTML", "CSS", "Sass", "GraphQL", "Solidity", "LabVIEW", "VBA",
+    # frameworks and libraries
+    "React.js", "ReactJS", "React Native", "Angular", "AngularJS", "Vue.js", "Next.js", "Node.js", "Express.js",
+    "Django", "Flask", "FastAPI", "Spring Boot", "Ruby on Rails", ".NET", "ASP.NET", "jQuery", "Bootstrap",
+    "Tailwind", "Redux", "Flutter", "Xamarin", "Unity3D", "Unreal Engine", "Qt", "Hibernate", "JUnit", "pytest",
+    "Selenium", "Cypress", "Jest", "NumPy", "pandas", "SciPy", "scikit-learn", "TensorFlow", "PyTorch", "Keras",
+    "OpenCV", "Hugging Face", "LangChain", "Apache Spark", "PySpark", "Hadoop", "Kafka", "Airflow", "dbt", "Flink",
+    # data and machine learning
+    "Machine Learning", "Deep Learning", "Natural Language Processing", "NLP", "Computer Vision",
+    "Reinforcement Learning", "Large Language Models", "LLM", "Generative AI", "Data Science", "Data Analysis",
+    "Data Engineering", "Data Visualization", "Data Modeling", "Data Mining", "Statistics", "A/B Testing",
+    "ETL", "Big Data", "Tableau", "Power BI", "Looker", "Snowflake", "Databricks", "BigQuery", "Redshift",
+    # databases
+    "PostgreSQL", "MySQL", "SQLite", "Oracle Database", "SQL Server", "MongoDB", "Redis", "Cassandra", "DynamoDB",
+    "Elasticsearch", "Neo4j", "Firebase",
+    # cloud and operations
+    "AWS", "Amazon Web Services", "Azure", "Google Cloud", "GCP", "Docker", "Kubernetes", "Terraform", "Ansible",
+    "Jenkins", "GitHub Actions", "GitLab CI", "CI/CD", "DevOps", "Linux", "Unix", "Nginx", "Serverless", "AWS Lambda",
+    "Microservices", "RESTful APIs", "gRPC", "Git", "Jira", "Confluence", "Prometheus", "Grafana",
+    "Datadog", "Splunk",
+    # engineering practice
+    "Object-Oriented Programming", "Functional Programming", "Distributed Systems", "System Design",
+    "Software Architecture", "Design Patterns", "Algorithms", "Data Structures", "Unit Testing",
+    "Test-Driven Development", "Agile", "Scrum", "Kanban", "Embedded Systems", "Firmware", "Networking", "TCP/IP",
+    "Cybersecurity", "Penetration Testing", "Cryptography", "Blockchain", "Mobile Development", "iOS", "Android",
+    "Web Development", "Front End", "Back End", "Full Stack", "UI/UX", "Figma", "Accessibility",
+    # engineering tools outside software
+    "AutoCAD", "SolidWorks", "CAD", "Simulink", "ANSYS", "PLC", "Arduino", "Raspberry Pi", "FPGA", "CNC",
+    # business and office
+    "Microsoft Excel", "Microsoft Office", "PowerPoint", "Google Sheets", "Salesforce", "SAP", "HubSpot",
+    "QuickBooks", "Project Management", "Product Management", "Stakeholder Management", "Financial Modeling",
+    "Accounting", "Budgeting", "Forecasting", "Market Research", "Digital Marketing", "SEO", "Copywriting",
+    "Customer Service", "Technical Writing", "Public Speaking",
+    "Six Sigma", "Lean Manufacturing", "PMP",
+]
+
+_WORD_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789+#")
+
+def _starts_word(text, start):
+    if start == 0:
+        return True
+    before = text[start - 1]
+    # "Node.js" and "T-SQL" are single words, "JS" and "SQL" are not in them
+    return before not in _WORD_CHARS and not (before in ".-" and start > 1 and text[start - 2] in _WORD_CHARS)
+
+def _ends_word(text, end):
+    if end + 1 == len(text):
+        return True
+    after = text[end + 1]
+    # a full stop ends a sentence, but not inside "node.js"
+    return after not in _WORD_CHARS and not (after == "." and end + 2 < len(text) and text[end + 2] in _WORD_CHARS)
+
+class SkillExtractor:
+    def __init__(self, names):
+        """
+        names: skill names to look for. Names that are the same skill (see skill_aliases) are merged, and the first of
+        them is the one reported
+        """
+        self.names = []
+        goto = [{}] # trie edges, state 0 is the root
+        outputs = [[]] # per state: (name position, pattern length) of the patterns ending there
+        seen = set()
+        for name in names:
+            name = str(name).strip()
+            if not name or sa.canonical_key(name) in seen:
+                continue
+            seen.add(sa.canonical_key(name))
+            position = len(self.names)
+            self.names.append(name)
+            for spelling in sa.search_spellings(name):
+                pattern = spelling.lower()
+                state = 0
+                for char in pattern:
+                    if char not in goto[state]:
+                        goto[state][char] = len(goto)
+                        goto.append({})
+                        outputs.append([])
+                    state = goto[state][char]
+                if not outputs[state]: # otherwise the spelling of a skill added earlier
+                    outputs[state].append((position, len(pattern)))
+
+        # breadth first, so a state's failure target is finished before the state itself: each state's transitions
+        # start as a copy of its failure target's and its own trie edges override them
+        self.transitions = [dict(goto[0])] + [None] * (len(goto) - 1)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        position = 0
+        while position < len(queue):
+            state = queue[position]
+            position += 1
+            self.transitions[state] = {**self.transitions[fail[state]], **goto[state]}
+            outputs[state] = outputs[state] + [output for output in outputs[fail[state]] if output not in outputs[state]]
+            for char, child in goto[state].items():
+                fail[child] = self.transitions[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+        self.outputs = outputs
+
+    def find(self, text):
+        """Return the skill names found in text, in the order they first appear"""
+        if not isinstance(text, str) or not text:
+            return []
+        text = text.lower()
+        transitions, outputs = self.transitions, self.outputs
+        found = {}
+        state = 0
+        for end, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                for name, length in outputs[state]:
+                    start = end - length + 1
+                    if _starts_word(text, start) and _ends_word(text, end):
+                        found.setdefault(name, start)
+        return [self.names[name] for name in sorted(found, key=found.get)]
+
+_extractor = None
+_extractor_key = None
+
+def get_extractor():
+    """
+    The extractor for the current skills bank, VOCABULARY and the skills in skill_aliases, rebuilt only when the
+    skills bank changes
+    """
+    global _extractor, _extractor_key
+    bank_names = [name for name in bs.get_bank("skills_bank.csv")["skill_name"] if isinstance(name, str)]
+    key = tuple(bank_names)
+    if _extractor is None or key != _extractor_key:
+        # the bank's spelling wins over the built-in one
+        _extractor = SkillExtractor(bank_names + VOCABULARY + list(sa.ALIASES))
+        _extractor_key = key
+    return _extractor
+
+def _is_empty(value):
+    if value is None:
+        return True
+    if isinstance(value, float) and value != value: # NaN
+        return True
+    if isinstance(value, str):
+        return value.strip() in ("", "[]", "nan", "None")
+    try:
+        return len(value) == 0
+    except TypeError:
+        return False
+
+def fill_skills(job_df, description_column="description", skills_column="skills"):
+    """
+    Fill in the skills column of every job in job_df that has none, from its description. Changes job_df in place.
+    Returns (jobs filled, megabytes of description text scanned, seconds taken).
+    """
+    if job_df.empty or description_column not in job_df.columns:
+        return 0, 0.0, 0.0
+    if skills_column not in job_df.columns:
+        job_df[skills_column] = None
+    job_df[skills_column] = job_df[skills_column].astype(object)
+
+    extractor = get_extractor()
+    filled = 0
+    scanned = 0
+    t1 = time.perf_counter()
+    for index, description, skills in zip(job_df.index, job_df[description_column], job_df[skills_column]):
+        if not _is_empty(skills) or not isinstance(description, str):
+            continue
+        scanned += len(description.encode("utf-8"))
+        found = extractor.find(description)
+        if found:
+            job_df.at[index, skills_column] = found
+            filled += 1
+    return filled, scanned / 1e6, time.perf_counter() - t1
@@ -1,7 +1,24 @@
-import pandas as pd
+import bank_store as bs
+import skill_aliases as sa
 import cli_util as cutil
 from cli_util import CommonConstraints as cc
 
+_name_index = None # skill_aliases.NameIndex over the skills bank
+_name_index_version = None # bank_store.version of the skills bank it was built from
+
+def _skill_names():
+    global _name_index, _name_index_version
+    skills_df = bs.get_bank('skills_bank.csv')
+    if _name_index is None or _name_index_version != bs.version('skills_bank.csv'):
+        _name_index = sa.NameIndex(skills_df['skill_name'])
+        _name_index_version = bs.version('skills_bank.csv')
+    return _name_index
+
+def _mark_index_current():
+    """After changing the bank and the index the same way, so the index is not rebuilt"""
+    global _name_index_version
+    _name_index_version = bs.version('skills_bank.csv')
+
 def adjust_skills(adjust_user_info):
     valid = {
         '1': {"desc": "View Skills", "func": view_skills}, 
@@ -15,7 +32,7 @@ def adjust_skills(adjust_user_info):
     return cutil.input_choice(prompt, valid, "Please type 1 to view skills, 2 to add a skill, 3 to remove a skill, 4 to edit a skill, or 5 to return to user info")
 
 def view_skills():
-    skills_df = pd.read_csv('Stored Info/skills_bank.csv')
+    skills_df = bs.get_bank('skills_bank.csv')
     print("\n" + "-"*30)
     print(skills_df)
     print("-"*30 + "\n")
@@ -30,25 +47,25 @@ def add_skill():
         
         level = cutil.input_int(prompt="Enter the level of proficiency as an integer from 1-10, 1 being Beginner to 10 being Master: ", constraint=cc.within_range(1,10), error_msg="Please enter an integer between 1 and 10 for the skill level.")
         
-        new_row = pd.DataFrame({'skill_name': [skill_name], 'level': [int(level)]})
-        
-        if skill_name.strip() == "" or not level.isdigit() or not (1 <= int(level) <= 10):
-            print("Invalid input. Skill name cannot be empty and level must be an integer between 1 and 10.")
+        if skill_name.strip() == "":
+            print("Invalid input. Skill name cannot be empty.")
             continue
         
-        if skill_name in pd.read_csv('Stored Info/skills_bank.csv')['skill_name'].values:
-            print(f"Skill '{skill_name}' already exists. Please enter a different skill.")
+        # "JS", "Javascript" and "JavaScript" are the same skill
+        skill_names = _skill_names()
+        existing = skill_names.get(skill_name)
+        if existing:
+            print(f"Skill '{skill_name}' already exists as '{existing[0]}'. Please enter a different skill.")
             continue
         
-        skills_df = pd.read_csv('Stored Info/skills_bank.csv')
-        skills_df = pd.concat([skills_df, new_row], ignore_index=True)
-        
-        skills_df.to_csv('Stored Info/skills_bank.csv', index=False)
+        bs.append_row('skills_bank.csv', {'skill_name': skill_name, 'level': int(level)})
+        skill_names.add(skill_name)
+        _mark_index_current()
         print(f"Skill '{skill_name}' added successfully.\n")
 
 def remove_skill():
     while True:
-        skills_df = pd.read_csv('Stored Info/skills_bank.csv')
+        skills_df = bs.get_bank('skills_bank.csv')
         
         skill_to_remove = input("Enter the name of the skill to remove (Type back to return to adjusting skills menu): ")
         
@@ -56,16 +73,27 @@ def remove_skill():
             adjust_skills()
             return
         
-        if skill_to_remove in skills_df['skill_name'].values:
-            skills_df = skills_df[skills_df['skill_name'] != skill_to_remove]
-            skills_df.to_csv('Stored Info/skills_bank.csv', index=False)
+        skill_names = _skill_names()
+        names = skill_names.get(skill_to_remove)
+        if skill_to_remove in names:
+            bs.remove_rows('skills_bank.csv', skills_df['skill_name'] == skill_to_remove)
+            skill_names.discard(skill_to_remove)
+            _mark_index_current()
             print(f"Skill '{skill_to_remove}' removed successfully.")
+        elif names:
+            # another spelling of the skill ("JS" for "JavaScript"), only removed once confirmed
+            matches = ", ".join(f"'{name}'" for name in names)
+            if cutil.input_yes_no(f"Skill '{skill_to_remove}' not found. Remove {matches}, the same skill under another spelling?"):
+                bs.remove_rows('skills_bank.csv', skills_df['skill_name'].isin(names))
+                skill_names.remove(skill_to_remove)
+                _mark_index_current()
+                print(f"Skill {matches} removed successfully.")
         else:
             print(f"Skill '{skill_to_remove}' not found.")
 
 def edit_skill():
     while True:
-        skills_df = pd.read_csv('Stored Info/skills_bank.csv')
+        skills_df = bs.get_bank('skills_bank.csv')
         
         skill_to_edit = input("Enter the name of the skill to edit (Type back to return to adjusting skills menu): ")
         
@@ -73,10 +101,13 @@ def edit_skill():
             adjust_skills()
             return
         
-        if skill_to_edit in skills_df['skill_name'].values:
+        names = _skill_names().get(skill_to_edit)
+        if names:
+            matches = skills_df['skill_name'].isin(names)
             new_level = cutil.input_int(prompt=f"Enter the new level for '{skill_to_edit}' as an integer from 1-10: ", constraint=cc.within_range(1,10), error_msg="Please enter an integer between 1 and 10 for the skill level.")
-            skills_df.loc[skills_df['skill_name'] == skill_to_edit, 'level'] = int(new_level)
-            skills_df.to_csv('Stored Info/skills_bank.csv', index=False)
+            skills_df.loc[matches, 'level'] = int(new_level)
+            bs.mark_dirty('skills_bank.csv')
+            _mark_index_current() # only the level changed
             print(f"Skill '{skill_to_edit}' updated successfully.")
         else:
             print(f"Skill '{skill_to_edit}' not found.")
\ No newline at end of file
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from pathlib import Path
+import llm_cache
+
+# One place that reads a streamed model reply.
+# Prints the answer as it arrives (and the reasoning, greyed out, when asked to), collects both into lists that are
+# joined once at the end, and appends time to first token, total time and tokens/sec for every call to
+# Cache/llm_metrics.jsonl. Once that file passes MAX_METRICS_BYTES it is cut back to the last KEEP_METRICS records.
+
+METRICS_PATH = Path("Cache") / "llm_metrics.jsonl"
+KEEP_METRICS = 1000 # records (~250 bytes each) kept when the log is trimmed
+MAX_METRICS_BYTES = 1024 * 1024 # well above KEEP_METRICS records, so the log is only rewritten every few thousand calls
+
+_metrics_lock = threading.Lock() # batch analysis streams from several threads
+
+class StreamResult:
+    def __init__(self, text, reasoning, first_token, total, tokens, prompt_tokens=None, stopped_early=False):
+        self.text = text
+        self.reasoning = reasoning
+        self.first_token = first_token # seconds until the first reasoning or answer token, None if nothing came back
+        self.total = total
+        self.tokens = tokens
+        self.prompt_tokens = prompt_tokens # as reported by Ollama, None when the client does not pass it on
+        self.stopped_early = stopped_early # the stop callback ended the stream before the model was done
+
+    @property
+    def tokens_per_sec(self):
+        generating = self.total - (self.first_token or 0)
+        return self.tokens / generating if generating > 0 else None
+
+def consume(stream, show_reasoning=False, show_content=True, report_first_token=False, label=None, model=None, log=True, stop=None):
+    """
+    Read a langchain chat stream (chunks with .content and additional_kwargs["reasoning_content"]) to the end, or
+    until stop(content), called with each piece of the answer, returns True.
+    Returns a StreamResult with the answer text, the reasoning and the timings of the call.
+    """
+    t_start = time.perf_counter()
+    first_token = None
+    content_parts = []
+    reasoning_parts = []
+    chunks = 0
+    usage = None
+    stopped_early = False
+
+    for chunk in stream:
+        reasoning = chunk.additional_kwargs.get("reasoning_content", "")
+        content = chunk.content
+        if (reasoning or content) and first_token is None:
+            first_token = time.perf_counter() - t_start
+            if report_first_token:
+                print(f"First token received after: {first_token:.2f}s")
+        if reasoning or content:
+            chunks += 1 # Ollama sends one token per chunk
+        usage = getattr(chunk, "usage_metadata", None) or usage
+
+        if reasoning:
+            reasoning_parts.append(reasoning)
+            if show_reasoning:
+                print(f"\033[90m{reasoning}\033[0m", end="", flush=True)
+        if content:
+            content_parts.append(content)
+            if show_content:
+                print(content, end="", flush=True)
+            if stop is not None and stop(content):
+                stopped_early = True
+                break
+
+    if stopped_early and hasattr(stream, "close"):
+        stream.close() # drops the http connection, which makes Ollama stop generating
+
+    result = StreamResult(
+        "".join(content_parts),
+        "".join(reasoning_parts),
+        first_token,
+        time.perf_counter() - t_start,
+        usage.get("output_tokens", chunks) if usage else chunks,
+        usage.get("input_tokens") if usage else None,
+        stopped_early,
+    )
+    if log:
+        log_metrics(result, label, model)
+    return result
+
+def log_metrics(result, label=None, model=None):
+    record = {
+        "time": round(time.time(), 3),
+        "label": label,
+        "model": model,
+        "first_token": round(result.first_token, 4) if result.first_token is not None else None,
+        "total": round(result.total, 4),
+        "tokens": result.tokens,
+        "tokens_per_sec": round(result.tokens_per_sec, 2) if result.tokens_per_sec else None,
+        "prompt_tokens": result.prompt_tokens,
+        "stopped_early": result.stopped_early,
+    }
+    with _metrics_lock:
+        METRICS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(METRICS_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            size = f.tell()
+        if size > MAX_METRICS_BYTES:
+            _trim_metrics()
+
+def _trim_metrics():
+    lines = METRICS_PATH.read_text(encoding="utf-8").splitlines(keepends=True)
+    tmp_path = METRICS_PATH.with_suffix(".jsonl.tmp")
+    tmp_path.write_text("".join(lines[-KEEP_METRICS:]), encoding="utf-8")
+    tmp_path.replace(METRICS_PATH)
+
+def stream_with_cache(chain, model, template, inputs, show_reasoning=False, label=None, stop=None):
+    """
+    Stream the first answer of a conversation to the terminal, or print the saved answer when this exact prompt
+    was answered before (a saved answer is still passed to stop, so a parser sees it too). Returns the answer text.
+    """
+    cached_response = llm_cache.get(model, template, inputs)
+    if cached_response is not None:
+        print("Using the saved answer from a previous identical request (start with --no-llm-cache to regenerate)\n")
+        print(cached_response)
+        if stop is not None:
+            stop(cached_response)
+        return cached_response
+
+    print("Waiting for first token...")
+    print("Initializing Response (May take a bit to get started)...\n")
+    result = consume(chain.stream(inputs), show_reasoning=show_reasoning, report_first_token=True, label=label, model=model, stop=stop)
+    if result.stopped_early:
+        print("\n(Stopped the model once the answer was complete)")
+    llm_cache.put(model, template, inputs, result.text)
+    return result.text
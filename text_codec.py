@@ -0,0 +1,64 @@
+import re
+import zlib
+from collections import Counter
+
+# Compression for long job posting text.
+# Postings share a lot of boilerplate (benefits blurbs, EEO statements, "About us" paragraphs), which plain zlib
+# cannot exploit on a single short posting. A preset dictionary built from our own postings gives zlib that shared
+# context up front, so each posting compresses as if the boilerplate had already been seen.
+
+DICT_SIZE = 32 * 1024 # zlib can only look back 32KB, anything longer is wasted
+LEVEL = 9
+
+_SEGMENT_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[A-Za-z][A-Za-z+#.\-]{3,}")
+
+def train_dictionary(samples, size=DICT_SIZE):
+    """
+    Build a zlib preset dictionary from sample texts: sentences that show up in several postings first, then
+    common words to fill the rest. The most valuable strings go last, since zlib reaches the end of the
+    dictionary with the shortest back-references.
+    """
+    segment_counts = Counter()
+    word_counts = Counter()
+    for text in samples:
+        if not text:
+            continue
+        # document frequency, a sentence repeated inside one posting is not boilerplate
+        segment_counts.update({segment.strip() for segment in _SEGMENT_SPLIT.split(text) if len(segment.strip()) >= 20})
+        word_counts.update(set(_WORD.findall(text)))
+
+    shared = [(count * len(segment), segment) for segment, count in segment_counts.items() if count >= 2]
+    shared.sort(reverse=True)
+
+    chosen = []
+    used = 0
+    for _, segment in shared:
+        encoded = segment.encode("utf-8")
+        if used + len(encoded) + 1 > size:
+            continue
+        chosen.append(encoded)
+        used += len(encoded) + 1
+
+    words = []
+    for word, count in word_counts.most_common():
+        encoded = word.encode("utf-8")
+        if count < 2 or used + len(encoded) + 1 > size:
+            break
+        words.append(encoded)
+        used += len(encoded) + 1
+
+    # least valuable first, most valuable at the end
+    return b" ".join(reversed(words)) + b"\n" + b"\n".join(reversed(chosen))
+
+def compress(text, zdict=None):
+    if text is None:
+        return None
+    compressor = zlib.compressobj(LEVEL, zdict=zdict) if zdict else zlib.compressobj(LEVEL)
+    return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+def decompress(blob, zdict=None):
+    if blob is None:
+        return None
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return (decompressor.decompress(blob) + decompressor.flush()).decode("utf-8")
@@ -1,8 +1,8 @@
-import pandas as pd
 import time
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate
 import re
+import bank_store as bs
+import models
+import streaming
 import cli_util as cutil
 from cli_util import CommonConstraints as cc
 
@@ -19,13 +19,15 @@ def adjust_work_experience(adjust_user_info):
     return cutil.input_choice(prompt, valid, "Please type 1 to view work experience, 2 to add work experience, 3 to remove work experience, 4 to edit work experience, or 5 to return to user info")
 
 def view_work_experience():
-    work_experience_df = pd.read_csv('Stored Info/work_experience_bank.csv')
+    work_experience_df = bs.get_bank('work_experience_bank.csv')
     print("\n" + "-"*30)
     print(work_experience_df)
     print("-"*30 + "\n")
     adjust_work_experience()
 
 def add_work_experience():
+    # the bullet writer may be used below, load its model while the details are typed in
+    models.warm_up_async(models.REASONING_MODEL)
     while True:
         company = input("Enter the company name (Type back to return to adjusting work experience menu): ")
         if company.lower() == "back":
@@ -43,28 +45,23 @@ def add_work_experience():
         long_short_mapping = {'S': False, 'L': True}
         
         
-        work_experience_df = pd.read_csv('Stored Info/work_experience_bank.csv')
-        
-        new_row = pd.DataFrame(
-            {'company': [company], 
-             'role': [role], 
-             'start_month': [start_month],
-             'start_year': [start_year],
-             'end_month': [end_month],
-             'end_year': [end_year],
-             'long_short': [long_short_mapping[long_short.upper()]],
-             'description_short': [description_short],
-             'bullet1_long': [bullet1_long],
-             'bullet2_long': [bullet2_long],
-             'bullet3_long': [bullet3_long]})
-        
-        work_experience_df = pd.concat([work_experience_df, new_row], ignore_index=True)
-        work_experience_df.to_csv('Stored Info/work_experience_bank.csv', index=False)
+        bs.append_row('work_experience_bank.csv',
+            {'company': company, 
+             'role': role, 
+             'start_month': start_month,
+             'start_year': start_year,
+             'end_month': end_month,
+             'end_year': end_year,
+             'long_short': long_short_mapping[long_short.upper()],
+             'description_short': description_short,
+             'bullet1_long': bullet1_long,
+             'bullet2_long': bullet2_long,
+             'bullet3_long': bullet3_long})
         print(f"Work experience at '{company}' added successfully.\n")
 
 def remove_work_experience():
     while True:
-        work_experience_df = pd.read_csv('Stored Info/work_experience_bank.csv')
+        work_experience_df = bs.get_bank('work_experience_bank.csv')
         
         company_to_remove = input("Enter the company name to remove work experience from (Type back to return to adjusting work experience menu): ")
         
@@ -78,12 +75,10 @@ def remove_work_experience():
             print(all_roles_at_company)
             chosen_role = input("Enter the role you want to remove (or type 'all' to remove all experiences at this company): ")
             if chosen_role.lower() == 'all':
-                work_experience_df = work_experience_df[work_experience_df['company'] != company_to_remove]
-                work_experience_df.to_csv('Stored Info/work_experience_bank.csv', index=False)
+                bs.remove_rows('work_experience_bank.csv', work_experience_df['company'] == company_to_remove)
                 print(f"All work experiences at '{company_to_remove}' removed successfully.")
             elif chosen_role in all_roles_at_company['role'].values:
-                work_experience_df = work_experience_df[~((work_experience_df['company'] == company_to_remove) & (work_experience_df['role'] == chosen_role))]
-                work_experience_df.to_csv('Stored Info/work_experience_bank.csv', index=False)
+                bs.remove_rows('work_experience_bank.csv', (work_experience_df['company'] == company_to_remove) & (work_experience_df['role'] == chosen_role))
                 print(f"Work experience as '{chosen_role}' at '{company_to_remove}' removed successfully.")
             else:
                 print(f"Role '{chosen_role}' not found at '{company_to_remove}'.")
@@ -102,7 +97,7 @@ def work_experience_description_writer():
         description_short = ""
         method = cutil.input_yes_no(prompt="You will now input three bullet points that describe your responsibilities and achievements. Would you like to have AI help you generate them? (y/n): ")
         
-        if method.upper() == "A":
+        if method:
             print("Loading assistant...")
             generate_bullets_prompt = """
             
@@ -148,41 +143,18 @@ def work_experience_description_writer():
             
             
             t1 = time.time()
-            generative_model = ChatOllama(model="deepseek-r1", streaming=True, reasoning=True)
+            generative_model = models.get_model(models.REASONING_MODEL, streaming=True, reasoning=True)
             print(f"Model init took: {time.time() - t1:.2f}s")
             
             t2 = time.time()
-            prompt = ChatPromptTemplate.from_template(generate_bullets_prompt)
-            chain = prompt | generative_model
+            chain = models.get_chain(generate_bullets_prompt, models.REASONING_MODEL, streaming=True, reasoning=True)
             print(f"Chain creation took: {time.time() - t2:.2f}s")
             
             user_desc = input("Please write a bit about the job you did, focusing on your responsibilities and achievements. The AI will take this answer and help streamline it.\n>>> ")
             
             inputs = {"description_short": user_desc}
             
-            print("Waiting for first token...")
-            t3 = time.time()
-            
-            print("Initializing Response (May take a bit to get started)...\n")
-            first_token_received = False
-            
-            summary_text = ""
-            
-            for chunk in chain.stream(inputs):
-                if not first_token_received:
-                    print(f"First token received after: {time.time() - t3:.2f}s")
-                    first_token_received = True
-                # Check for reasoning (thinking) tokens
-                # These are usually in additional_kwargs when reasoning=True
-                reasoning = chunk.additional_kwargs.get("reasoning_content", "")
-                if reasoning and showReasoning:
-                    print(f"\033[90m{reasoning}\033[0m", end="", flush=True)
-                
-                # Check for the actual answer tokens
-                content = chunk.content
-                if content:
-                    print(content, end="", flush=True)
-                    summary_text += content
+            summary_text = streaming.stream_with_cache(chain, models.REASONING_MODEL, generate_bullets_prompt, inputs, showReasoning, label="work experience bullets")
             
             bullet_pattern = r"[\s\S]*?Bullet Point 1:\s*([^\n]*)\n[\s\S]*?Bullet Point 2:\s*([^\n]*)\n[\s\S]*?Bullet Point 3:\s*([^\n]*)[\s\S]*"
             
@@ -195,8 +167,7 @@ def work_experience_description_writer():
             
             summary_text = f"Bullet Point 1: {bp1.strip()}\nBullet Point 2: {bp2.strip()}\nBullet Point 3: {bp3.strip()}" # this whole thing is to combat hallucinations
             
-            followup_prompt = ChatPromptTemplate.from_template(refine_bullets_prompt)
-            followup_chain = followup_prompt | generative_model
+            followup_chain = models.get_chain(refine_bullets_prompt, models.REASONING_MODEL, streaming=True, reasoning=True)
             
             while True: # fix formatting here, we want it to match previous messages
                 user_input = input("\nAsk a followup question (or type 'exit' to quit) >>> ").strip()
@@ -211,19 +182,7 @@ def work_experience_description_writer():
                     "description_short": user_desc
                 }
                 
-                summary_text = ""
-                
-                for chunk in followup_chain.stream(followup_inputs):
-                    # Check for reasoning (thinking) tokens
-                    reasoning = chunk.additional_kwargs.get("reasoning_content", "")
-                    if reasoning and showReasoning:
-                        print(f"\033[90m{reasoning}\033[0m", end="", flush=True)
-                    
-                    # Check for the actual answer tokens
-                    content = chunk.content
-                    if content:
-                        print(content, end="", flush=True)
-                        summary_text += content
+                summary_text = streaming.consume(followup_chain.stream(followup_inputs), show_reasoning=showReasoning, label="work experience bullets refinement", model=models.REASONING_MODEL).text
                 
                 bullet_pattern = r"[\s\S]*?Bullet Point 1:\s*([^\n]*)\n[\s\S]*?Bullet Point 2:\s*([^\n]*)\n[\s\S]*?Bullet Point 3:\s*([^\n]*)[\s\S]*"
             
@@ -240,7 +199,7 @@ def work_experience_description_writer():
             bullet2_long = bp2.strip()
             bullet3_long = bp3.strip()
             
-        elif method.upper() == "M":
+        else:
             bullet1_long = input("Give a quick description of your responsibilities and achievements (1/3): ")
             bullet2_long = input("Give a quick description of your responsibilities and achievements (2/3): ")
             bullet3_long = input("Give a quick description of your responsibilities and achievements (3/3): ")
@@ -248,8 +207,9 @@ def work_experience_description_writer():
     return long_short, description_short, bullet1_long, bullet2_long, bullet3_long
 
 def edit_work_experience():
+    models.warm_up_async(models.REASONING_MODEL)
     while True:
-        work_experience_df = pd.read_csv('Stored Info/work_experience_bank.csv')
+        work_experience_df = bs.get_bank('work_experience_bank.csv')
         
         company_to_edit = input("Enter the company name to edit work experience from (Type back to return to adjusting work experience menu): ")
         
@@ -275,7 +235,7 @@ def edit_work_experience():
                 work_experience_df.loc[(work_experience_df['company'] == company_to_edit) & (work_experience_df['role'] == chosen_role), 
                                        ['role', 'start_month', 'start_year', 'end_month', 'end_year', 'long_short', 'description_short', 'bullet1_long', 'bullet2_long', 'bullet3_long']] = [
                                            role, start_month, start_year, end_month, end_year, long_short_mapping[long_short.upper()], description_short, bullet1_long, bullet2_long, bullet3_long]
-                work_experience_df.to_csv('Stored Info/work_experience_bank.csv', index=False)
+                bs.mark_dirty('work_experience_bank.csv')
                 print(f"Work experience as '{chosen_role}' at '{company_to_edit}' updated successfully.")
             else:
                 print(f"Role '{chosen_role}' not found at '{company_to_edit}'.")